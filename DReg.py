@@ -1,20 +1,400 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+import argparse
+import asyncio
+import base64
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
 import warnings
+import zipfile
 warnings.filterwarnings('ignore')
 
+# matplotlib n'est importé qu'au premier rendu (voir _figure et _pyplot) : une exécution
+# qui ne produit que des données ne charge jamais la pile graphique.
+IMPORT_TIME = time.perf_counter() - _IMPORT_START
+
+def _pyplot():
+    """Importe matplotlib.pyplot à la demande (affichage uniquement)"""
+    import matplotlib.pyplot as plt
+    return plt
+
+def _figure(**kwargs):
+    """Figure hors écran (canevas Agg) indépendante de pyplot
+    
+    Les rendus sans affichage n'importent pas pyplot et ne changent pas le
+    backend global : une session interactive ou Jupyter garde ses affichages.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _imsave(output, image, **kwargs):
+    """Enregistre une image RGBA (matplotlib.image.imsave, sans pyplot)"""
+    import matplotlib.image
+    matplotlib.image.imsave(output, image, **kwargs)
+
+def _style(style):
+    """Style matplotlib limité au bloc englobé (sans modifier les rcParams globaux)"""
+    import matplotlib.style
+    return matplotlib.style.context(style)
+
+class StageProfiler:
+    """Instrumentation par étapes : durée, temps CPU et allocations de chaque span
+    
+    S'attache à un analyseur (analyzer.profiler = StageProfiler()) ; les spans
+    couvrent chaque _simulate_*, les tendances, chaque _plot_*, savefig et les
+    exports. memory=True active tracemalloc (écart d'allocations par span),
+    cprofile=True enregistre un profil cProfile pendant les spans.
+    Une copie envoyée à un processus de travail repart sans spans ni profil
+    cProfile ; ses spans sont fusionnés par merge().
+    close() (ou un bloc with) arrête tracemalloc s'il a été démarré par ce
+    profiler : sinon toutes les allocations suivantes du processus restent tracées.
+    """
+    
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.events = []
+        self._depth = 0
+        self._origin = time.perf_counter()
+        self._profile = None
+        if cprofile:
+            import cProfile
+            self._profile = cProfile.Profile()
+        self._start_tracing()
+    
+    def __getstate__(self):
+        return {**self.__dict__, 'events': [], '_profile': None}
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._start_tracing()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _start_tracing(self):
+        """Démarre tracemalloc (memory=True) s'il ne tourne pas déjà dans ce processus"""
+        self._tracing = False
+        if self.memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+    
+    def close(self):
+        """Arrête tracemalloc s'il a été démarré par ce profiler (les spans restent lisibles)"""
+        if self._tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._tracing = False
+        self.memory = False
+    
+    def merge(self, events, pid):
+        """Ajoute les spans d'un processus de travail (même horloge, origine commune)"""
+        self.events.extend({**event, "processus": pid} for event in events)
+    
+    @contextlib.contextmanager
+    def span(self, name, category='analyse'):
+        """Mesure le bloc englobé"""
+        if self._profile is not None and self._depth == 0:
+            self._profile.enable()
+        self._depth += 1
+        if self.memory:
+            import tracemalloc
+            memory_start = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._depth -= 1
+            event = {
+                "nom": name,
+                "categorie": category,
+                "debut_s": wall_start - self._origin,
+                "duree_s": wall,
+                "cpu_s": cpu,
+                "profondeur": self._depth,
+            }
+            if self.memory:
+                event["allocations_octets"] = tracemalloc.get_traced_memory()[0] - memory_start
+            self.events.append(event)
+            if self._profile is not None and self._depth == 0:
+                self._profile.disable()
+    
+    def summary(self):
+        """Totaux par span (DataFrame trié par durée décroissante)"""
+        if not self.events:
+            return pd.DataFrame(columns=["nom", "appels", "duree_s", "cpu_s"])
+        events = pd.DataFrame(self.events)
+        summary = events.groupby("nom").agg(appels=("nom", "size"), duree_s=("duree_s", "sum"),
+                                             cpu_s=("cpu_s", "sum"))
+        return summary.sort_values("duree_s", ascending=False).reset_index()
+    
+    def to_json(self, path):
+        """Écrit la trace structurée (liste des spans) en JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"spans": self.events}, f, ensure_ascii=False, indent=2)
+        return path
+    
+    def to_chrome_trace(self, path):
+        """Écrit la trace au format Chrome (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        trace = [{
+            "name": event["nom"],
+            "cat": event["categorie"],
+            "ph": "X",
+            "ts": event["debut_s"] * 1e6,
+            "dur": event["duree_s"] * 1e6,
+            "pid": event.get("processus", pid),
+            "tid": 0,
+            "args": {key: value for key, value in event.items()
+                     if key in ("cpu_s", "allocations_octets")},
+        } for event in self.events]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return path
+    
+    def dump_stats(self, path):
+        """Enregistre le profil cProfile (lisible avec pstats ou snakeviz)"""
+        if self._profile is None:
+            raise ValueError("Profil cProfile non activé (StageProfiler(cprofile=True))")
+        self._profile.dump_stats(path)
+        return path
+
 class ReunionCollectiviteFinanceAnalyzer:
-    def __init__(self, collectivite_name, collectivite_type):
+    # Spécification déclarative des séries, dans l'ordre des colonnes. Chaque série vaut
+    #   base * part * croissance * multiplicateurs * bruit
+    # "base": budget_base ou population_base de la configuration (absente : part seule)
+    # "croissance": taux annuel ou nom d'un paramètre de config["parametres"] (absente : 0)
+    # "depuis": année de départ d'une rampe (absente : croissance depuis start_year)
+    # "multiplicateurs": ("annees", [années], facteur) ou ("periode", (début, fin ou None), facteur),
+    #   le premier qui s'applique l'emporte
+    # "bruit": écart-type du bruit multiplicatif (absent : pas de bruit)
+    # "flux": identifiant stable du flux aléatoire de la série (même colonne, même flux dans
+    #   les deux types ; une nouvelle série prend un identifiant encore inutilisé)
+    SERIES_SPECS = {
+        "departement": [
+            # Démographie, recettes, dépenses et indicateurs financiers
+            {"colonne": "Population", "flux": 0, "base": "population_base", "part": 1, "croissance": "croissance_population"},
+            {"colonne": "Recettes_Totales", "flux": 1, "base": "budget_base", "part": 1, "croissance": "croissance_recettes", "bruit": 0.07},
+            {"colonne": "Impots_Locaux", "flux": 2, "base": "budget_base", "part": 0.25, "croissance": "croissance_impots", "bruit": 0.08},
+            {"colonne": "Dotations_Etat", "flux": 3, "base": "budget_base", "part": 0.55, "croissance": "croissance_dotations", "depuis": 2010, "bruit": 0.05},
+            {"colonne": "Autres_Recettes", "flux": 4, "base": "budget_base", "part": 0.12, "croissance": "croissance_autres_recettes", "bruit": 0.09},
+            {"colonne": "Fonds_Europeens", "flux": 5, "base": "budget_base", "part": 0.08, "croissance": "croissance_fonds_europeens", "bruit": 0.15,
+             "multiplicateurs": [("periode", (2007, 2013), 1.2), ("periode", (2014, 2020), 1.4), ("periode", (2021, None), 1.3)]},
+            {"colonne": "Depenses_Totales", "flux": 6, "base": "budget_base", "part": 0.98, "croissance": "croissance_depenses", "bruit": 0.06},
+            {"colonne": "Fonctionnement", "flux": 7, "base": "budget_base", "part": 0.70, "croissance": "croissance_fonctionnement", "bruit": 0.05},
+            {"colonne": "Investissement", "flux": 8, "base": "budget_base", "part": 0.28, "croissance": "croissance_investissement", "bruit": 0.16,
+             "multiplicateurs": [("annees", [2007, 2013, 2019, 2024], 1.6), ("annees", [2009, 2015, 2021], 0.8)]},
+            {"colonne": "Charge_Dette", "flux": 9, "base": "budget_base", "part": 0.06, "croissance": "croissance_charge_dette", "depuis": 2005, "bruit": 0.10},
+            {"colonne": "Personnel", "flux": 10, "base": "budget_base", "part": 0.40, "croissance": "croissance_personnel", "bruit": 0.04},
+            {"colonne": "Epargne_Brute", "flux": 11, "base": "budget_base", "part": 0.04, "croissance": "croissance_epargne", "depuis": 2010, "bruit": 0.14},
+            {"colonne": "Dette_Totale", "flux": 12, "base": "budget_base", "part": 0.80, "bruit": 0.09,
+             "multiplicateurs": [("annees", [2007, 2013, 2019, 2024], 1.2), ("annees", [2009, 2015, 2021], 0.9)]},
+            {"colonne": "Taux_Endettement", "flux": 13, "part": 0.75, "croissance": -0.009, "depuis": 2010, "bruit": 0.06},
+            {"colonne": "Taux_Fiscalite", "flux": 14, "part": 0.82, "croissance": 0.004, "depuis": 2010, "bruit": 0.03},
+            # Investissements spécifiques au Département
+            {"colonne": "Investissement_Action_Sociale", "flux": 15, "base": "budget_base", "part": 0.08, "croissance": 0.035, "bruit": 0.15,
+             "multiplicateurs": [("annees", [2005, 2010, 2015, 2020], 1.8)]},
+            {"colonne": "Investissement_Education", "flux": 16, "base": "budget_base", "part": 0.06, "croissance": 0.032, "bruit": 0.18,
+             "multiplicateurs": [("annees", [2008, 2014, 2020], 1.7)]},
+            {"colonne": "Investissement_Routes", "flux": 17, "base": "budget_base", "part": 0.05, "croissance": 0.03, "bruit": 0.16,
+             "multiplicateurs": [("annees", [2006, 2012, 2018, 2023], 1.9)]},
+            {"colonne": "Investissement_Sante", "flux": 18, "base": "budget_base", "part": 0.04, "croissance": 0.034, "bruit": 0.17,
+             "multiplicateurs": [("annees", [2009, 2015, 2021], 1.8)]},
+            {"colonne": "Investissement_Culture", "flux": 19, "base": "budget_base", "part": 0.03, "croissance": 0.028, "bruit": 0.15,
+             "multiplicateurs": [("annees", [2010, 2016, 2022], 1.7)]},
+        ],
+        "region": [
+            # Démographie, recettes, dépenses et indicateurs financiers
+            {"colonne": "Population", "flux": 0, "base": "population_base", "part": 1, "croissance": "croissance_population"},
+            {"colonne": "Recettes_Totales", "flux": 1, "base": "budget_base", "part": 1, "croissance": "croissance_recettes", "bruit": 0.07},
+            {"colonne": "Impots_Locaux", "flux": 2, "base": "budget_base", "part": 0.20, "croissance": "croissance_impots", "bruit": 0.08},
+            {"colonne": "Dotations_Etat", "flux": 3, "base": "budget_base", "part": 0.60, "croissance": "croissance_dotations", "depuis": 2010, "bruit": 0.05},
+            {"colonne": "Autres_Recettes", "flux": 4, "base": "budget_base", "part": 0.08, "croissance": "croissance_autres_recettes", "bruit": 0.09},
+            {"colonne": "Fonds_Europeens", "flux": 5, "base": "budget_base", "part": 0.12, "croissance": "croissance_fonds_europeens", "bruit": 0.15,
+             "multiplicateurs": [("periode", (2007, 2013), 1.2), ("periode", (2014, 2020), 1.4), ("periode", (2021, None), 1.3)]},
+            {"colonne": "Depenses_Totales", "flux": 6, "base": "budget_base", "part": 0.98, "croissance": "croissance_depenses", "bruit": 0.06},
+            {"colonne": "Fonctionnement", "flux": 7, "base": "budget_base", "part": 0.65, "croissance": "croissance_fonctionnement", "bruit": 0.05},
+            {"colonne": "Investissement", "flux": 8, "base": "budget_base", "part": 0.33, "croissance": "croissance_investissement", "bruit": 0.16,
+             "multiplicateurs": [("annees", [2007, 2013, 2019, 2024], 1.6), ("annees", [2009, 2015, 2021], 0.8)]},
+            {"colonne": "Charge_Dette", "flux": 9, "base": "budget_base", "part": 0.05, "croissance": "croissance_charge_dette", "depuis": 2005, "bruit": 0.10},
+            {"colonne": "Personnel", "flux": 10, "base": "budget_base", "part": 0.35, "croissance": "croissance_personnel", "bruit": 0.04},
+            {"colonne": "Epargne_Brute", "flux": 11, "base": "budget_base", "part": 0.05, "croissance": "croissance_epargne", "depuis": 2010, "bruit": 0.14},
+            {"colonne": "Dette_Totale", "flux": 12, "base": "budget_base", "part": 0.75, "bruit": 0.09,
+             "multiplicateurs": [("annees", [2007, 2013, 2019, 2024], 1.2), ("annees", [2009, 2015, 2021], 0.9)]},
+            {"colonne": "Taux_Endettement", "flux": 13, "part": 0.70, "croissance": -0.009, "depuis": 2010, "bruit": 0.06},
+            {"colonne": "Taux_Fiscalite", "flux": 14, "part": 0.78, "croissance": 0.004, "depuis": 2010, "bruit": 0.03},
+            # Investissements spécifiques à la Région
+            {"colonne": "Investissement_Lycees", "flux": 20, "base": "budget_base", "part": 0.07, "croissance": 0.035, "bruit": 0.17,
+             "multiplicateurs": [("annees", [2008, 2014, 2020], 1.8)]},
+            {"colonne": "Investissement_Formation", "flux": 21, "base": "budget_base", "part": 0.06, "croissance": 0.036, "bruit": 0.18,
+             "multiplicateurs": [("annees", [2009, 2015, 2021], 1.9)]},
+            {"colonne": "Investissement_Transport", "flux": 22, "base": "budget_base", "part": 0.08, "croissance": 0.04, "bruit": 0.20,
+             "multiplicateurs": [("annees", [2007, 2013, 2019, 2024], 2.0)]},
+            {"colonne": "Investissement_Economie", "flux": 23, "base": "budget_base", "part": 0.05, "croissance": 0.033, "bruit": 0.16,
+             "multiplicateurs": [("annees", [2010, 2016, 2022], 1.7)]},
+            {"colonne": "Investissement_Tourisme", "flux": 24, "base": "budget_base", "part": 0.04, "croissance": 0.035, "bruit": 0.19,
+             "multiplicateurs": [("annees", [2011, 2017, 2023], 1.8)]},
+        ],
+    }
+    
+    # Flux aléatoire de chaque série, tiré de SERIES_SPECS : {colonne: identifiant}
+    SERIES_STREAMS = {spec["colonne"]: spec["flux"] for specs in SERIES_SPECS.values() for spec in specs}
+    
+    # Séries de niveau (stocks, effectifs, taux) : reportées telles quelles en infra-annuel
+    LEVEL_COLUMNS = ('Population', 'Dette_Totale', 'Taux_Endettement', 'Taux_Fiscalite')
+    
+    # Poids mensuels relatifs des flux (janvier à décembre), répartition uniforme par défaut
+    SEASONAL_PROFILES = {
+        # Fiscalité locale : encaissements concentrés en fin d'année (avis d'imposition)
+        'Impots_Locaux': [0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.8, 2.0, 2.4, 2.3],
+        # Fonds européens : versements sur appels de fonds, en juin et en décembre
+        'Fonds_Europeens': [0.3, 0.3, 0.6, 0.4, 0.4, 2.5, 0.3, 0.3, 0.8, 0.4, 0.7, 5.0],
+        # Service de la dette : échéances semestrielles
+        'Charge_Dette': [0.3, 0.3, 0.3, 0.3, 0.3, 4.5, 0.3, 0.3, 0.3, 0.3, 0.3, 4.5],
+        # Investissement (et ses secteurs) : mandatements croissants jusqu'à la clôture
+        'Investissement': [0.4, 0.5, 0.7, 0.8, 0.9, 1.0, 0.8, 0.6, 1.1, 1.3, 1.6, 2.3],
+        # Autres recettes : participations et produits des services, plus fortes en fin d'exercice
+        'Autres_Recettes': [0.8, 0.8, 0.9, 0.9, 1.0, 1.0, 0.9, 0.8, 1.0, 1.1, 1.2, 1.6],
+    }
+    
+    # Nombre de réplicas tirés par un même générateur
+    REPLICA_BLOCK = 32
+    
+    # Nombre de compilations de SERIES_SPECS gardées (une par période et sélection de colonnes) :
+    # en génération par morceaux, chaque morceau est une nouvelle période
+    COMPILED_SPECS_CACHE = 16
+    
+    # Tendances spécifiques à La Réunion, appliquées dans l'ordre de la table.
+    # "periode": (première, dernière année incluse, None = sans fin)
+    # "type": restreint la règle à un type de collectivité
+    # "sauf": période exclue (branche elif de la règle précédente)
+    TREND_RULES = [
+        # Développement initial (2002-2005)
+        {"periode": (2002, 2005), "type": "departement",
+         "colonnes": {"Investissement_Action_Sociale": 1.4, "Investissement_Routes": 1.5}},
+        {"periode": (2002, 2005), "type": "region",
+         "colonnes": {"Investissement_Lycees": 1.4, "Investissement_Transport": 1.6}},
+        
+        # Plan de développement réunionnais (2006-2010)
+        {"periode": (2006, 2010),
+         "colonnes": {"Dotations_Etat": 1.12, "Fonds_Europeens": 1.25, "Investissement": 1.18}},
+        
+        # Impact de la crise financière (2008-2009)
+        {"periode": (2008, 2009),
+         "colonnes": {"Recettes_Totales": 0.94, "Investissement": 0.82}},
+        
+        # Développement du tourisme et des infrastructures (2011-2015)
+        {"periode": (2011, 2015), "sauf": (2008, 2009), "type": "departement",
+         "colonnes": {"Investissement_Sante": 1.3}},
+        {"periode": (2011, 2015), "sauf": (2008, 2009), "type": "region",
+         "colonnes": {"Investissement_Tourisme": 1.5, "Investissement_Transport": 1.4}},
+        
+        # Crise sociale de 2018 et plan de soutien
+        {"periode": (2018, 2018),
+         "colonnes": {"Dotations_Etat": 1.15}},
+        {"periode": (2018, 2018), "type": "departement",
+         "colonnes": {"Investissement_Action_Sociale": 1.4}},
+        
+        # Impact de la crise COVID-19 (2020) : baisse des recettes mais soutien de l'État et de l'Europe
+        {"periode": (2020, 2020),
+         "colonnes": {"Autres_Recettes": 0.75, "Dotations_Etat": 1.18, "Fonds_Europeens": 1.22}},
+        
+        # Plan de relance post-COVID spécifique aux DOM (2022-2025)
+        {"periode": (2022, None),
+         "colonnes": {"Investissement": 1.16}},
+        {"periode": (2022, None), "type": "departement",
+         "colonnes": {"Investissement_Sante": 1.3}},
+        {"periode": (2022, None), "type": "region",
+         "colonnes": {"Investissement_Economie": 1.4, "Investissement_Formation": 1.35}},
+    ]
+    
+    # Panneaux du tableau de bord 4x2, dans l'ordre d'affichage : (méthode, accepte les bandes)
+    DASHBOARD_PANELS = (
+        ('_plot_revenue_expenses', True),         # 1. Évolution des recettes et dépenses
+        ('_plot_revenue_structure', False),       # 2. Structure des recettes
+        ('_plot_expenses_structure', False),      # 3. Structure des dépenses
+        ('_plot_investments', True),              # 4. Investissements
+        ('_plot_debt', True),                     # 5. Dette et endettement
+        ('_plot_performance_indicators', True),   # 6. Indicateurs de performance
+        ('_plot_demography', True),               # 7. Démographie
+        ('_plot_sectorial_investments', False),   # 8. Investissements sectoriels
+    )
+    
+    # Taille d'un panneau rendu seul (pouces) : un huitième de la figure 20x24
+    PANEL_SIZE = (10, 6)
+    
+    # Taille maximale du cache d'images de panneaux (.render_cache/, entrées les moins récentes supprimées)
+    RENDER_CACHE_BYTES = 256 * 2**20
+    
+    # Colonnes lues par chaque panneau ("Investissement_*" : secteurs de la collectivité)
+    PANEL_COLUMNS = {
+        '_plot_revenue_expenses': ['Recettes_Totales', 'Depenses_Totales'],
+        '_plot_revenue_structure': ['Impots_Locaux', 'Dotations_Etat', 'Fonds_Europeens', 'Autres_Recettes'],
+        '_plot_expenses_structure': ['Fonctionnement', 'Investissement', 'Charge_Dette', 'Personnel'],
+        '_plot_investments': ['Investissement_*'],
+        '_plot_debt': ['Dette_Totale', 'Taux_Endettement'],
+        '_plot_performance_indicators': ['Epargne_Brute', 'Taux_Fiscalite'],
+        '_plot_demography': ['Population'],
+        '_plot_sectorial_investments': ['Investissement_*'],
+    }
+    
+    # Style matplotlib du tableau de bord (fait partie de la clé du cache de rendu)
+    PLOT_STYLE = 'seaborn-v0_8'
+    
+    # Niveaux de qualité du tableau de bord : résolution, format, suffixe du fichier,
+    # recadrage serré (bbox_inches='tight', qui coûte un second dessin complet)
+    RENDER_QUALITIES = {
+        'apercu': {'dpi': 72, 'format': 'png', 'suffixe': '_apercu', 'serre': False},
+        'svg': {'dpi': 72, 'format': 'svg', 'suffixe': '_apercu', 'serre': False},
+        'impression': {'dpi': 300, 'format': 'png', 'suffixe': '', 'serre': True},
+    }
+    
+    def __init__(self, collectivite_name, collectivite_type, seed=None, start_year=2002, end_year=2025):
         self.collectivite = collectivite_name
         self.type = collectivite_type  # 'departement' ou 'region'
+        
+        # Graine racine : un flux aléatoire indépendant par série et par bloc de réplicas
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.seed = self.seed_sequence.entropy
+        # Sans graine donnée, self.seed est une entropie fraîche : les données ne se répètent pas
+        self.seeded = seed is not None
+        
+        # SERIES_SPECS compilées, par période et sélection de colonnes (LRU, voir COMPILED_SPECS_CACHE)
+        self._compiled_specs = OrderedDict()
+        
+        # Instrumentation optionnelle (voir StageProfiler)
+        self.profiler = None
+        
+        # Tableau de bord réutilisé d'un rendu à l'autre (voir dashboard), et artistes
+        # notés par _record pendant sa construction
+        self._dashboard = None
+        self._recorded_artists = None
         self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#F9A602', '#6A0572', 
                       '#AB83A1', '#5CAB7D', '#2A9D8F', '#E76F51', '#264653']
         
-        self.start_year = 2002
-        self.end_year = 2025
+        self.start_year = start_year
+        self.end_year = end_year
         
         # Configuration spécifique pour chaque collectivité
         self.config = self._get_collectivite_config()
@@ -26,6 +406,7 @@ class ReunionCollectiviteFinanceAnalyzer:
                 "Département Réunion": {
                     "population_base": 865000,
                     "budget_base": 1850 if self.type == "departement" else 950,
+                    "parametres": self._default_parameters(),
                     "type": self.type,
                     "specialites": ["action_sociale", "education", "routes", "culture", "environnement", "sante"]
                 }
@@ -35,6 +416,7 @@ class ReunionCollectiviteFinanceAnalyzer:
                 "Région Réunion": {
                     "population_base": 865000,
                     "budget_base": 950,
+                    "parametres": self._default_parameters(),
                     "type": self.type,
                     "specialites": ["developpement_economique", "lycees", "formation", "transport", "amenagement", "tourisme"]
                 }
@@ -42,627 +424,817 @@ class ReunionCollectiviteFinanceAnalyzer:
         
         return configs.get(self.collectivite, configs["Département Réunion" if self.type == "departement" else "Région Réunion"])
     
-    def generate_financial_data(self):
-        """Génère des données financières pour la collectivité"""
+    def _default_parameters(self):
+        """Taux de croissance annuels des séries principales (balayables par sweep_parameters)"""
+        return {
+            "croissance_population": 0.015,
+            "croissance_recettes": 0.038 if self.type == "departement" else 0.042,
+            "croissance_impots": 0.03,
+            "croissance_dotations": 0.01,        # à partir de 2010
+            "croissance_fonds_europeens": 0.025,
+            "croissance_autres_recettes": 0.028,
+            "croissance_depenses": 0.036,
+            "croissance_fonctionnement": 0.033,
+            "croissance_investissement": 0.03,
+            "croissance_charge_dette": 0.008,    # à partir de 2005
+            "croissance_personnel": 0.032,
+            "croissance_epargne": 0.007,         # à partir de 2010
+        }
+    
+    def __getstate__(self):
+        # La figure du tableau de bord et le profiler restent dans le processus qui les a créés
+        # (les rendus de panneaux en reçoivent une copie explicite, voir _render_panel_traced)
+        return {**self.__dict__, '_dashboard': None, 'profiler': None}
+    
+    def _span(self, name, category='analyse'):
+        """Span de profilage si un StageProfiler est attaché, sinon contexte vide"""
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.span(name, category)
+    
+    def generate_financial_data(self, freq='A', compact=False):
+        """Génère des données financières pour la collectivité
+        
+        freq: "A" (annuel), "Q" (trimestriel) ou "M" (mensuel). En infra-annuel,
+        les flux sont répartis selon SEASONAL_PROFILES et leurs sommes annuelles
+        sont égales aux valeurs annuelles.
+        compact: années en int16 et séries en float32 (voir to_compact)
+        """
         print(f"🏛️ Génération des données financières pour {self.collectivite}...")
         
-        # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
-        
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données démographiques
-        data['Population'] = self._simulate_population(dates)
+        # Créer une base de données annuelle (un indice par année)
+        years = np.arange(self.start_year, self.end_year + 1)
         
-        # Recettes
-        data['Recettes_Totales'] = self._simulate_total_revenue(dates)
-        data['Impots_Locaux'] = self._simulate_tax_revenue(dates)
-        data['Dotations_Etat'] = self._simulate_state_grants(dates)
-        data['Autres_Recettes'] = self._simulate_other_revenue(dates)
-        data['Fonds_Europeens'] = self._simulate_european_funds(dates)
+        series, values = self._simulate_kernel(years)
         
-        # Dépenses
-        data['Depenses_Totales'] = self._simulate_total_expenses(dates)
-        data['Fonctionnement'] = self._simulate_operating_expenses(dates)
-        data['Investissement'] = self._simulate_investment_expenses(dates)
-        data['Charge_Dette'] = self._simulate_debt_charges(dates)
-        data['Personnel'] = self._simulate_staff_costs(dates)
-        
-        # Indicateurs financiers
-        data['Epargne_Brute'] = self._simulate_gross_savings(dates)
-        data['Dette_Totale'] = self._simulate_total_debt(dates)
-        data['Taux_Endettement'] = self._simulate_debt_ratio(dates)
-        data['Taux_Fiscalite'] = self._simulate_tax_rate(dates)
+        # Ajouter des tendances spécifiques à La Réunion
+        with self._span('trends', 'simulation'):
+            values = self._apply_trends(values, series, years)
         
-        # Investissements spécifiques adaptés à La Réunion
-        if self.type == "departement":
-            data['Investissement_Action_Sociale'] = self._simulate_social_investment(dates)
-            data['Investissement_Education'] = self._simulate_education_investment(dates)
-            data['Investissement_Routes'] = self._simulate_roads_investment(dates)
-            data['Investissement_Sante'] = self._simulate_health_investment(dates)
-            data['Investissement_Culture'] = self._simulate_culture_investment(dates)
-        else:  # région
-            data['Investissement_Lycees'] = self._simulate_highschool_investment(dates)
-            data['Investissement_Formation'] = self._simulate_training_investment(dates)
-            data['Investissement_Transport'] = self._simulate_transport_investment(dates)
-            data['Investissement_Economie'] = self._simulate_economy_investment(dates)
-            data['Investissement_Tourisme'] = self._simulate_tourism_investment(dates)
+        df = pd.DataFrame({'Annee': years, **dict(zip(series, values.T))})
         
-        df = pd.DataFrame(data)
+        if freq != 'A':
+            with self._span(f'subannual:{freq}', 'simulation'):
+                df = self.to_subannual(df, freq)
         
-        # Ajouter des tendances spécifiques à La Réunion
-        self._add_collectivite_trends(df)
+        if compact:
+            df = to_compact(df)
         
         return df
     
-    def _simulate_population(self, dates):
-        """Simule la population de La Réunion (croissance forte)"""
-        base_population = self.config["population_base"]
-        
-        population = []
-        for i, date in enumerate(dates):
-            # Croissance démographique forte à La Réunion
-            growth_rate = 0.015  # 1.5% de croissance annuelle
-            
-            growth = 1 + growth_rate * i
-            population.append(base_population * growth)
-        
-        return population
+    def to_subannual(self, df, freq='M'):
+        """Convertit des données annuelles en données trimestrielles ("Q") ou mensuelles ("M")
+        
+        Les flux (recettes, dépenses, investissements, épargne) sont répartis
+        selon leur profil saisonnier ; les niveaux (LEVEL_COLUMNS) sont reportés
+        sur chaque période. Calcul entièrement vectorisé.
+        """
+        periods, label = {'Q': (4, 'Trimestre'), 'M': (12, 'Mois')}[freq]
+        n_years = len(df)
+        
+        data = {
+            'Annee': np.repeat(df['Annee'].to_numpy(), periods),
+            label: np.tile(np.arange(1, periods + 1), n_years),
+        }
+        for column in df.columns.drop('Annee'):
+            values = np.repeat(df[column].to_numpy(), periods)
+            if column not in self.LEVEL_COLUMNS:
+                values = values * np.tile(self._seasonal_profile(column, periods), n_years)
+            data[column] = values
+        
+        return pd.DataFrame(data)
     
-    def _simulate_total_revenue(self, dates):
-        """Simule les recettes totales de la collectivité"""
-        base_revenue = self.config["budget_base"]
-        
-        revenue = []
-        for i, date in enumerate(dates):
-            # Croissance variable selon le type de collectivité
-            if self.type == "departement":
-                growth_rate = 0.038
-            else:
-                growth_rate = 0.042
-                
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.07)
-            revenue.append(base_revenue * growth * noise)
-        
-        return revenue
+    def _seasonal_profile(self, column, periods):
+        """Part de chaque période dans le total annuel d'un flux (somme = 1)"""
+        key = 'Investissement' if column.startswith('Investissement') else column
+        weights = np.asarray(self.SEASONAL_PROFILES.get(key, [1.0] * 12), dtype=float)
+        weights = weights.reshape(periods, 12 // periods).sum(axis=1)
+        return weights / weights.sum()
     
-    def _simulate_tax_revenue(self, dates):
-        """Simule les recettes fiscales"""
-        if self.type == "departement":
-            base_tax = self.config["budget_base"] * 0.25
+    def generate_ensemble(self, n_replicas=1000, percentiles=(5, 50, 95), n_workers=None, compact=False):
+        """Génère un ensemble Monte Carlo de réalisations et leurs bandes de percentiles
+        
+        Toutes les réalisations sont simulées en un seul calcul vectorisé, ou
+        réparties sur n_workers processus avec un résultat identique au bit près.
+        Retourne un dictionnaire avec:
+        - "annees": tableau des années
+        - "series": noms des séries (ordre du dernier axe de "valeurs")
+        - "valeurs": tableau (n_replicas, n_annees, n_series)
+        - "bandes": DataFrame indexé par année, colonnes (série, "P5"/"P50"/"P95")
+        compact: "valeurs" en float32 (moitié de la mémoire)
+        """
+        print(f"🎲 Génération d'un ensemble de {n_replicas} réalisations pour {self.collectivite}...")
+        
+        years = np.arange(self.start_year, self.end_year + 1)
+        if n_workers is None or n_workers <= 1:
+            series, values = self._simulate_replicas(range(n_replicas))
         else:
-            base_tax = self.config["budget_base"] * 0.20
-        
-        tax_revenue = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.03 * i
-            noise = np.random.normal(1, 0.08)
-            tax_revenue.append(base_tax * growth * noise)
-        
-        return tax_revenue
+            bounds = np.linspace(0, n_replicas, n_workers + 1).astype(int)
+            shards = [range(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(self._simulate_replicas, shards))
+            series = results[0][0]
+            values = np.concatenate([shard_values for _, shard_values in results])
+        
+        if compact:
+            values = values.astype(np.float32)
+        
+        # Un seul appel pour tous les percentiles, années et séries
+        quantiles = np.percentile(values, percentiles, axis=0)  # (n_percentiles, n_annees, n_series)
+        labels = [f"P{p:g}" for p in percentiles]
+        bands = pd.DataFrame(
+            quantiles.transpose(1, 2, 0).reshape(len(years), -1),
+            index=pd.Index(years, name='Annee'),
+            columns=pd.MultiIndex.from_product([series, labels])
+        )
+        
+        return {"annees": years, "series": series, "valeurs": values, "bandes": bands}
     
-    def _simulate_state_grants(self, dates):
-        """Simule les dotations de l'État (importantes pour les DOM)"""
-        if self.type == "departement":
-            base_grants = self.config["budget_base"] * 0.55
-        else:
-            base_grants = self.config["budget_base"] * 0.60
-        
-        grants = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Augmentation des dotations pour les DOM
-            if year >= 2010:
-                increase = 1 + 0.01 * (year - 2010)
-            else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.05)
-            grants.append(base_grants * increase * noise)
-        
-        return grants
+    def sweep_parameters(self, grid, n_replicas=1, chunk_replicas=REPLICA_BLOCK):
+        """Évalue les KPI financiers sur toutes les combinaisons d'une grille de paramètres
+        
+        grid: {paramètre: valeurs}, paramètres parmi budget_base,
+        population_base et les clés de config["parametres"].
+        Chaque paramètre devient un axe d'un tenseur diffusé dans les
+        simulateurs : toute la grille est simulée en un seul calcul. Les mêmes
+        tirages aléatoires servent à tous les points (nombres aléatoires
+        communs), seuls les paramètres diffèrent d'un point à l'autre.
+        n_replicas: KPI moyennés sur les réplicas 0..n_replicas-1 ; avec 1, le
+        point des paramètres par défaut redonne generate_financial_data().
+        Retourne un DataFrame indexé par les combinaisons de paramètres.
+        """
+        names = list(grid)
+        
+        # Un axe par paramètre, suivi des axes (réplicas, années)
+        axes = [np.asarray(grid[name], dtype=float) for name in names]
+        grid_shape = tuple(len(values) for values in axes)
+        swept = {}
+        for k, (name, values) in enumerate(zip(names, axes)):
+            shape = [1] * (len(names) + 2)
+            shape[k] = len(values)
+            swept[name] = values.reshape(shape)
+        
+        config = self.config
+        self.config = self._with_parameters(swept)
+        
+        years = np.arange(self.start_year, self.end_year + 1)
+        totals = None
+        try:
+            with self._span('sweep', 'simulation'):
+                for first in range(0, n_replicas, chunk_replicas):
+                    replicas = range(first, min(first + chunk_replicas, n_replicas))
+                    series, values = self._simulate_kernel(years, replicas, columns=KPI_COLUMNS)
+                    values = self._apply_trends(values, series, years)
+                    
+                    values = np.broadcast_to(values, grid_shape + values.shape[-3:])
+                    kpis = {name: kpi.sum(axis=-1) for name, kpi in compute_kpis(values, series).items()}
+                    totals = kpis if totals is None else {name: totals[name] + kpis[name] for name in kpis}
+        finally:
+            self.config = config
+        
+        index = pd.MultiIndex.from_product(axes, names=names)
+        return pd.DataFrame({name: np.ravel(total / n_replicas) for name, total in totals.items()}, index=index)
     
-    def _simulate_european_funds(self, dates):
-        """Simule les fonds européens (importants pour La Réunion)"""
-        if self.type == "departement":
-            base_funds = self.config["budget_base"] * 0.08
-        else:
-            base_funds = self.config["budget_base"] * 0.12
-        
-        funds = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Cycles des fonds européens
-            if 2007 <= year <= 2013:
-                multiplier = 1.2  # Période de programmation 2007-2013
-            elif 2014 <= year <= 2020:
-                multiplier = 1.4  # Période de programmation 2014-2020
-            elif year >= 2021:
-                multiplier = 1.3  # Période de programmation 2021-2027
+    def _with_parameters(self, parameters):
+        """Copie de la configuration où les paramètres donnés sont remplacés
+        
+        parameters: {nom: valeur}, noms parmi budget_base, population_base et
+        les clés de config["parametres"].
+        """
+        unknown = [name for name in parameters
+                   if name not in ('budget_base', 'population_base') and name not in self.config["parametres"]]
+        if unknown:
+            raise ValueError(f"Paramètres inconnus: {', '.join(unknown)}")
+        
+        config = {**self.config, "parametres": dict(self.config["parametres"])}
+        for name, value in parameters.items():
+            if name in ('budget_base', 'population_base'):
+                config[name] = value
             else:
-                multiplier = 1.0
-            
-            growth = 1 + 0.025 * i
-            noise = np.random.normal(1, 0.15)
-            funds.append(base_funds * growth * multiplier * noise)
-        
-        return funds
+                config["parametres"][name] = value
+        return config
     
-    def _simulate_other_revenue(self, dates):
-        """Simule les autres recettes"""
-        if self.type == "departement":
-            base_other = self.config["budget_base"] * 0.12
-        else:
-            base_other = self.config["budget_base"] * 0.08
-        
-        other_revenue = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.028 * i
-            noise = np.random.normal(1, 0.09)
-            other_revenue.append(base_other * growth * noise)
-        
-        return other_revenue
+    def dependency_graph(self, df=None):
+        """Graphe de dépendances paramètres -> séries -> KPI et panneaux
+        
+        Les tendances s'appliquent colonne par colonne : une série tendancielle
+        ne dépend que de la série simulée du même nom.
+        Retourne {"parametres": {paramètre: [séries]}, "kpis": {KPI: [séries]},
+        "panneaux": {panneau: [séries]}}.
+        """
+        parameters = {name: [] for name in ('budget_base', 'population_base', *self.config["parametres"])}
+        for spec in self.SERIES_SPECS[self.type]:
+            for name in (spec.get("base"), spec.get("croissance")):
+                if isinstance(name, str):
+                    parameters[name].append(spec["colonne"])
+        
+        columns = pd.Index([spec["colonne"] for spec in self.SERIES_SPECS[self.type]]) if df is None else df.columns
+        return {
+            "parametres": parameters,
+            "kpis": {name: list(definition[0]) for name, definition in KPI_DEFINITIONS.items()},
+            "panneaux": {panel: self._panel_columns(panel, columns) for panel, _ in self.DASHBOARD_PANELS},
+        }
     
-    def _simulate_total_expenses(self, dates):
-        """Simule les dépenses totales"""
-        base_expenses = self.config["budget_base"] * 0.98
-        
-        expenses = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.036 * i
-            noise = np.random.normal(1, 0.06)
-            expenses.append(base_expenses * growth * noise)
-        
-        return expenses
+    def affected_by(self, parameters, df=None):
+        """Séries, KPI et panneaux à recalculer quand les paramètres donnés changent"""
+        graph = self.dependency_graph(df)
+        series = [spec["colonne"] for spec in self.SERIES_SPECS[self.type]
+                  if any(spec["colonne"] in graph["parametres"][name] for name in parameters)]
+        return {
+            "series": series,
+            "kpis": [name for name, columns in graph["kpis"].items() if set(columns) & set(series)],
+            "panneaux": [panel for panel, columns in graph["panneaux"].items() if set(columns) & set(series)],
+        }
     
-    def _simulate_operating_expenses(self, dates):
-        """Simule les dépenses de fonctionnement"""
-        if self.type == "departement":
-            base_operating = self.config["budget_base"] * 0.70
-        else:
-            base_operating = self.config["budget_base"] * 0.65
-        
-        operating = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.033 * i
-            noise = np.random.normal(1, 0.05)
-            operating.append(base_operating * growth * noise)
-        
-        return operating
+    def _simulate_replicas(self, replicas):
+        """Simule un sous-ensemble de réplicas (range d'indices), tendances incluses
+        
+        Retourne (noms des séries, tableau (len(replicas), n_annees, n_series)).
+        """
+        years = np.arange(self.start_year, self.end_year + 1)
+        series, values = self._simulate_kernel(years, replicas)
+        with self._span('trends', 'simulation'):
+            values = self._apply_trends(values, series, years)
+        return series, values
     
-    def _simulate_investment_expenses(self, dates):
-        """Simule les dépenses d'investissement"""
-        if self.type == "departement":
-            base_investment = self.config["budget_base"] * 0.28
-        else:
-            base_investment = self.config["budget_base"] * 0.33
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Plans d'investissement spécifiques aux DOM
-            if year in [2007, 2013, 2019, 2024]:
-                multiplier = 1.6
-            elif year in [2009, 2015, 2021]:
-                multiplier = 0.8
-            else:
-                multiplier = 1.0
+    def iter_financial_data(self, chunk_years=25, replicas=None):
+        """Génère les données par morceaux de chunk_years années (générateur)
+        
+        Les tendances et les flux aléatoires se prolongent d'un morceau à
+        l'autre : la concaténation des morceaux est identique à
+        generate_financial_data(). Avec replicas (range d'indices), chaque
+        morceau est au format long avec une colonne "Replica".
+        Seul un morceau est en mémoire à la fois.
+        """
+        all_years = np.arange(self.start_year, self.end_year + 1)
+        # Générateurs propres à ce flux, prolongés d'un morceau à l'autre : l'analyseur
+        # reste utilisable (et cohérent) pendant que le générateur est suspendu
+        rngs = {}
+        for first in range(0, len(all_years), chunk_years):
+            years = all_years[first:first + chunk_years]
+            series, values = self._simulate_kernel(years, replicas, rngs=rngs)
+            values = self._apply_trends(values, series, years)
             
-            growth = 1 + 0.03 * i
-            noise = np.random.normal(1, 0.16)
-            investment.append(base_investment * growth * multiplier * noise)
-        
-        return investment
-    
-    def _simulate_debt_charges(self, dates):
-        """Simule les charges de la dette"""
-        if self.type == "departement":
-            base_debt_charge = self.config["budget_base"] * 0.06
-        else:
-            base_debt_charge = self.config["budget_base"] * 0.05
-        
-        debt_charges = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2005:
-                increase = 1 + 0.008 * (year - 2005)
+            if replicas is None:
+                yield pd.DataFrame({'Annee': years, **dict(zip(series, values.T))})
             else:
-                increase = 1
-            
-            noise = np.random.normal(1, 0.10)
-            debt_charges.append(base_debt_charge * increase * noise)
-        
-        return debt_charges
+                yield pd.DataFrame({
+                    'Replica': np.repeat(np.asarray(replicas), len(years)),
+                    'Annee': np.tile(years, len(replicas)),
+                    **dict(zip(series, values.reshape(-1, len(series)).T)),
+                })
     
-    def _simulate_staff_costs(self, dates):
-        """Simule les dépenses de personnel"""
-        if self.type == "departement":
-            base_staff = self.config["budget_base"] * 0.40
-        else:
-            base_staff = self.config["budget_base"] * 0.35
-        
-        staff_costs = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.032 * i
-            noise = np.random.normal(1, 0.04)
-            staff_costs.append(base_staff * growth * noise)
-        
-        return staff_costs
+    def iter_ensemble(self, n_replicas, chunk_replicas=1024, chunk_years=None):
+        """Génère un ensemble par blocs de réplicas (et d'années si chunk_years)
+        
+        Chaque morceau est un DataFrame au format long (Replica, Annee, séries).
+        """
+        n_years = self.end_year - self.start_year + 1
+        for first in range(0, n_replicas, chunk_replicas):
+            replicas = range(first, min(first + chunk_replicas, n_replicas))
+            yield from self.iter_financial_data(chunk_years or n_years, replicas)
     
-    def _simulate_gross_savings(self, dates):
-        """Simule l'épargne brute"""
-        if self.type == "departement":
-            base_saving = self.config["budget_base"] * 0.04
+    def stream_financial_data(self, stem, fmt='csv', chunk_years=25, n_replicas=None, chunk_replicas=1024):
+        """Écrit les données morceau par morceau dans un CSV ou un Parquet, à mémoire bornée
+        
+        Sans n_replicas, une seule réalisation par morceaux d'années ; sinon un
+        ensemble au format long par blocs de réplicas.
+        Retourne le chemin du fichier écrit.
+        """
+        if n_replicas is None:
+            chunks = self.iter_financial_data(chunk_years)
         else:
-            base_saving = self.config["budget_base"] * 0.05
-        
-        savings = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2010:
-                improvement = 1 + 0.007 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.14)
-            savings.append(base_saving * improvement * noise)
-        
-        return savings
-    
-    def _simulate_total_debt(self, dates):
-        """Simule la dette totale"""
-        if self.type == "departement":
-            base_debt = self.config["budget_base"] * 0.80
+            chunks = self.iter_ensemble(n_replicas, chunk_replicas, chunk_years)
+        
+        if fmt == 'csv':
+            path = stem + '.csv'
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                for k, chunk in enumerate(chunks):
+                    chunk.to_csv(f, index=False, header=(k == 0))
+        elif fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            path = stem + '.parquet'
+            writer = None
+            try:
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(path, table.schema)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
         else:
-            base_debt = self.config["budget_base"] * 0.75
-        
-        debt = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2007, 2013, 2019, 2024]:
-                change = 1.2
-            elif year in [2009, 2015, 2021]:
-                change = 0.9
-            else:
-                change = 1.0
-            
-            noise = np.random.normal(1, 0.09)
-            debt.append(base_debt * change * noise)
+            raise ValueError(f"Écriture par morceaux disponible en csv ou parquet, pas en {fmt}")
         
-        return debt
+        return path
     
-    def _simulate_debt_ratio(self, dates):
-        """Simule le taux d'endettement"""
-        ratios = []
-        for i, date in enumerate(dates):
-            if self.type == "departement":
-                base_ratio = 0.75
-            else:
-                base_ratio = 0.70
-            
-            year = date.year
-            if year >= 2010:
-                improvement = 1 - 0.009 * (year - 2010)
-            else:
-                improvement = 1
-            
-            noise = np.random.normal(1, 0.06)
-            ratios.append(base_ratio * improvement * noise)
-        
-        return ratios
+    def _simulate_series(self, years, replicas=None, columns=None):
+        """Simule toutes les séries de la collectivité (sans tendances)
+        
+        Retourne {colonne: tableau (n_annees,) ou (len(replicas), n_annees)}.
+        columns: ne simuler que ces séries
+        """
+        series, values = self._simulate_kernel(years, replicas, columns)
+        return dict(zip(series, np.moveaxis(values, -1, 0)))
     
-    def _simulate_tax_rate(self, dates):
-        """Simule le taux de fiscalité (moyen)"""
-        rates = []
-        for i, date in enumerate(dates):
-            if self.type == "departement":
-                base_rate = 0.82
-            else:
-                base_rate = 0.78
+    def _compile_series_specs(self, years, columns=None):
+        """Compile SERIES_SPECS en tableaux pour une période (mis en cache par période)
+        
+        Retourne (spécifications retenues, origines des croissances (n_series,),
+        multiplicateurs (n_annees, n_series)).
+        """
+        key = (self.start_year, int(years[0]), len(years), None if columns is None else tuple(columns))
+        if key in self._compiled_specs:
+            self._compiled_specs.move_to_end(key)
+            return self._compiled_specs[key]
+        
+        specs = [spec for spec in self.SERIES_SPECS[self.type]
+                 if columns is None or spec["colonne"] in columns]
+        origins = np.array([spec.get("depuis", self.start_year) for spec in specs])
+        
+        multipliers = np.ones((len(years), len(specs)))
+        for k, spec in enumerate(specs):
+            conditions, factors = [], []
+            for kind, when, factor in spec.get("multiplicateurs", []):
+                if kind == "annees":
+                    conditions.append(np.isin(years, when))
+                else:
+                    first, last = when
+                    conditions.append((years >= first) & (years <= (last if last is not None else years[-1])))
+                factors.append(factor)
+            if conditions:
+                multipliers[:, k] = np.select(conditions, factors, default=1.0)
+        
+        self._compiled_specs[key] = (specs, origins, multipliers)
+        while len(self._compiled_specs) > self.COMPILED_SPECS_CACHE:
+            self._compiled_specs.popitem(last=False)
+        return self._compiled_specs[key]
+    
+    def _simulate_kernel(self, years, replicas=None, columns=None, rngs=None):
+        """Simule toutes les séries en un seul calcul batché (sans tendances)
+        
+        Retourne (noms des séries, tableau (..., n_annees, n_series)) : la forme
+        est (n_annees, n_series) sans replicas, (len(replicas), n_annees,
+        n_series) avec. Des paramètres de configuration de forme (..., 1, 1)
+        (balayages) ajoutent leurs axes en tête.
+        rngs: générateurs d'un flux par morceaux (voir _block_rng)
+        """
+        with self._span('kernel:compile', 'simulation'):
+            specs, origins, multipliers = self._compile_series_specs(years, columns)
+        
+        with self._span('kernel:parametres', 'simulation'):
+            parameters = self.config["parametres"]
+            bases = [(self.config[spec["base"]] if "base" in spec else 1.0) * spec["part"] for spec in specs]
+            rates = [spec.get("croissance", 0.0) for spec in specs]
+            rates = [parameters[rate] if isinstance(rate, str) else rate for rate in rates]
+            bases = np.stack(np.broadcast_arrays(*bases), axis=-1)
+            rates = np.stack(np.broadcast_arrays(*rates), axis=-1)
+        
+        # Un flux aléatoire par série : les tirages restent ceux des séries prises isolément
+        with self._span('kernel:bruit', 'simulation'):
+            noises = [self._noise(spec["colonne"], years, spec["bruit"], replicas, rngs) if "bruit" in spec
+                      else np.ones(len(years)) for spec in specs]
+            noise = np.stack(np.broadcast_arrays(*noises), axis=-1)
+        
+        with self._span('kernel:combinaison', 'simulation'):
+            # Croissance linéaire depuis l'origine de chaque série, 1 avant (rampes)
+            offsets = years[:, None] - origins
+            growth = np.where(offsets >= 0, 1 + rates * offsets, 1.0)
+            values = bases * growth * multipliers * noise
+        
+        return [spec["colonne"] for spec in specs], values
+    
+    # Flux aléatoires des séries
+    def _series_rng(self, column, block):
+        """Générateur indépendant pour une série et un bloc de réplicas
+        
+        La graine est celle de seed_sequence.spawn()[série].spawn()[bloc],
+        construite directement : spawn() est incrémental et ne redonnerait
+        pas les mêmes enfants d'un appel à l'autre.
+        """
+        spawn_key = self.seed_sequence.spawn_key + (self.SERIES_STREAMS[column], block)
+        seed = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=spawn_key,
+                                      pool_size=self.seed_sequence.pool_size)
+        return np.random.default_rng(seed)
+    
+    def _block_rng(self, column, block, rngs=None):
+        """Générateur d'un bloc de réplicas
+        
+        rngs: {(colonne, bloc): générateur} d'une génération par morceaux ; le
+        même générateur sert à tous les morceaux d'années : son flux se
+        prolonge et les valeurs sont celles d'un tirage en une fois.
+        """
+        if rngs is None:
+            return self._series_rng(column, block)
+        if (column, block) not in rngs:
+            rngs[(column, block)] = self._series_rng(column, block)
+        return rngs[(column, block)]
+    
+    def _noise(self, column, years, sigma, replicas=None, rngs=None):
+        """Bruit multiplicatif gaussien, tiré en une seule fois pour toute la série
+        
+        replicas: range des indices de réplicas, le tirage a alors la forme
+        (len(replicas), n_annees). Sans replicas, on renvoie le réplica 0.
+        Le réplica 0 (réalisation unique) a son propre flux, le bloc 0 : il ne
+        tire que ses propres valeurs. Le réplica r > 0 vient toujours de la
+        ligne (r - 1) % REPLICA_BLOCK du bloc 1 + (r - 1) // REPLICA_BLOCK :
+        le résultat ne dépend pas du découpage.
+        """
+        indices = range(1) if replicas is None else replicas
+        if len(indices) == 0:
+            return np.empty((0, len(years)))
+        
+        parts = []
+        if indices.start == 0:
+            parts.append(self._block_rng(column, 0, rngs).normal(1, sigma, size=(1, len(years))))
+        
+        others = range(max(indices.start, 1), indices.stop)
+        if len(others):
+            first_block = (others.start - 1) // self.REPLICA_BLOCK
+            last_block = (others[-1] - 1) // self.REPLICA_BLOCK
+            draws = np.concatenate([
+                # Tirage année par année (axe 0) puis transposé en (réplicas, années)
+                self._block_rng(column, 1 + block, rngs).normal(1, sigma, size=(len(years), self.REPLICA_BLOCK)).T
+                for block in range(first_block, last_block + 1)
+            ])
+            offset = 1 + first_block * self.REPLICA_BLOCK
+            parts.append(draws[others.start - offset:others.stop - offset])
+        
+        draws = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        return draws[0] if replicas is None else draws
+    
+    def _compile_trend_rules(self, years):
+        """Compile la table des tendances en vecteurs multiplicateurs par colonne
+        
+        Retourne {colonne: tableau (k, n_annees)} où chaque ligne est le
+        multiplicateur d'une règle, dans l'ordre de la table.
+        """
+        compiled = {}
+        for rule in self.TREND_RULES:
+            if rule.get("type", self.type) != self.type:
+                continue
             
-            year = date.year
-            if year >= 2010:
-                increase = 1 + 0.004 * (year - 2010)
-            else:
-                increase = 1
+            first, last = rule["periode"]
+            mask = years >= first
+            if last is not None:
+                mask &= years <= last
+            if "sauf" in rule:
+                excl_first, excl_last = rule["sauf"]
+                mask &= ~((years >= excl_first) & (years <= excl_last))
             
-            noise = np.random.normal(1, 0.03)
-            rates.append(base_rate * increase * noise)
+            for column, factor in rule["colonnes"].items():
+                compiled.setdefault(column, []).append(np.where(mask, factor, 1.0))
         
-        return rates
+        return {column: np.vstack(factors) for column, factors in compiled.items()}
     
-    # Méthodes d'investissement spécifiques au Département
-    def _simulate_social_investment(self, dates):
-        """Simule l'investissement dans l'action sociale"""
-        base_investment = self.config["budget_base"] * 0.08
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2005, 2010, 2015, 2020]:
-                year_multiplier = 1.8
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.035 * i
-            noise = np.random.normal(1, 0.15)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+    def _trend_factors(self, years, series):
+        """Multiplicateurs des tendances des séries concernées
+        
+        Retourne (positions dans series, tableau (k, n_annees, n_positions)
+        complété par des 1).
+        """
+        compiled = self._compile_trend_rules(years)
+        positions = [k for k, column in enumerate(series) if column in compiled]
+        depth = max((len(compiled[series[k]]) for k in positions), default=0)
+        factors = np.ones((depth, len(years), len(positions)))
+        for j, k in enumerate(positions):
+            factors[:len(compiled[series[k]]), :, j] = compiled[series[k]]
+        return positions, factors
     
-    def _simulate_education_investment(self, dates):
-        """Simule l'investissement éducatif (collèges)"""
-        base_investment = self.config["budget_base"] * 0.06
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2008, 2014, 2020]:
-                year_multiplier = 1.7
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.032 * i
-            noise = np.random.normal(1, 0.18)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+    def _apply_trends(self, values, series, years):
+        """Applique les tendances à un tableau (..., n_annees, n_series), en place"""
+        positions, factors = self._trend_factors(years, series)
+        if positions:
+            # Produits successifs, dans l'ordre de la table : mêmes arrondis que les *= d'origine
+            trended = values[..., positions]
+            for factor in factors:
+                trended = trended * factor
+            values[..., positions] = trended
+        return values
     
-    def _simulate_roads_investment(self, dates):
-        """Simule l'investissement dans les routes"""
-        base_investment = self.config["budget_base"] * 0.05
+    def _apply_collectivite_trends(self, data, years):
+        """Applique les tendances à des séries de forme (..., n_annees), en place dans data"""
+        series = list(data)
+        values = np.stack(np.broadcast_arrays(*data.values()), axis=-1)
+        data.update(zip(series, np.moveaxis(self._apply_trends(values, series, years), -1, 0)))
+    
+    def _add_collectivite_trends(self, df):
+        """Ajoute des tendances réalistes adaptées à La Réunion"""
+        data = {column: df[column].to_numpy() for column in df.columns if column != 'Annee'}
+        self._apply_collectivite_trends(data, df['Annee'].to_numpy())
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2006, 2012, 2018, 2023]:
-                year_multiplier = 1.9
+        for column, values in data.items():
+            df[column] = values
+    
+    def create_financial_analysis(self, df, bands=None, output_dir='.', show=True,
+                                  n_workers=None, output_format='png', cache=True, dpi=300, insights=True,
+                                  quality=None):
+        """Crée une analyse complète des finances de la collectivité
+        
+        bands: bandes de percentiles de generate_ensemble()["bandes"], tracées
+        en zones ombrées (percentiles extrêmes, P5-P95 par défaut) autour des courbes
+        output_dir: dossier où enregistrer le PNG
+        show: afficher la figure (sinon elle est fermée après enregistrement)
+        n_workers: si renseigné, chaque panneau est rendu séparément (dans un
+        processus distinct si > 1) puis les images sont assemblées
+        output_format: "png" (tableau de bord assemblé) ou "pdf" (un panneau par
+        page, rendu par panneaux uniquement)
+        cache: réutiliser le fichier existant si les données, la configuration,
+        le style et la résolution n'ont pas changé ; en rendu par panneaux,
+        seuls les panneaux dont les colonnes ont changé sont redessinés
+        dpi: résolution du fichier enregistré
+        insights: afficher les insights textuels après le rendu
+        quality: niveau de RENDER_QUALITIES ("apercu", "svg", "impression") ;
+        remplace dpi et output_format, l'aperçu est enregistré à part
+        (suffixe "_apercu") pour ne pas écraser la version d'impression
+        
+        Retourne le chemin du fichier enregistré.
+        """
+        tight = True
+        suffix = ''
+        if quality is not None:
+            settings = self.RENDER_QUALITIES[quality]
+            dpi, output_format = settings['dpi'], settings['format']
+            suffix, tight = settings['suffixe'], settings['serre']
+        
+        os.makedirs(output_dir, exist_ok=True)
+        stem = os.path.join(output_dir, f'{self.collectivite.replace(" ", "_")}_financial_analysis{suffix}')
+        # Rendu par panneaux : PDF, ou PNG avec n_workers (le SVG reste une figure vectorielle unique)
+        by_panel = output_format == 'pdf' or (n_workers is not None and output_format == 'png')
+        output_file = f'{stem}.{output_format}'
+        key = self._render_key(df, bands, dpi=dpi, extra=(output_format, by_panel, tight))
+        
+        if cache and not show and self._read_cache_key(output_file) == key:
+            print(f"♻️ Rendu inchangé, réutilisation de {output_file}")
+        else:
+            # La clé précédente ne décrit plus le fichier qui va être réécrit
+            self._drop_cache_key(output_file)
+            if by_panel:
+                self._render_dashboard_parallel(df, bands, stem, n_workers or 1, output_format, dpi, cache)
+            elif not show and bands is None:
+                self.dashboard(df).save(output_file, dpi, tight)
             else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.03 * i
-            noise = np.random.normal(1, 0.16)
-            investment.append(base_investment * growth * year_multiplier * noise)
+                self._render_dashboard(df, bands, output_file, show, dpi, tight)
+            # Clé écrite seulement là où elle sera relue (pas d'affichage, cache actif)
+            if cache and not show:
+                self._write_cache_key(output_file, key)
         
-        return investment
-    
-    def _simulate_health_investment(self, dates):
-        """Simule l'investissement dans la santé"""
-        base_investment = self.config["budget_base"] * 0.04
+        # Générer les insights
+        if insights:
+            self._generate_financial_insights(df)
         
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2009, 2015, 2021]:
-                year_multiplier = 1.8
+        return output_file
+    
+    def render_in_background(self, df, bands=None, output_dir='.', quality='impression', n_workers=None):
+        """Lance le rendu d'un niveau de qualité dans un processus d'arrière-plan
+        
+        Retourne un Future dont le résultat est le chemin du fichier : l'aperçu
+        peut être servi tout de suite et la version d'impression récupérée
+        seulement si on la demande (future.result()).
+        """
+        return _background_executor().submit(
+            self.create_financial_analysis, df, bands, output_dir, show=False, n_workers=n_workers,
+            insights=False, quality=quality
+        )
+    
+    def _panel_columns(self, panel, df):
+        """Colonnes de df (ou d'un index de colonnes) lues par un panneau"""
+        available = df.columns if isinstance(df, pd.DataFrame) else df
+        columns = []
+        for column in self.PANEL_COLUMNS[panel]:
+            if column.endswith('*'):
+                columns += [c for c in available if c.startswith(column[:-1])]
             else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.034 * i
-            noise = np.random.normal(1, 0.17)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+                columns.append(column)
+        return columns
     
-    def _simulate_culture_investment(self, dates):
-        """Simule l'investissement culturel"""
-        base_investment = self.config["budget_base"] * 0.03
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2010, 2016, 2022]:
-                year_multiplier = 1.7
+    def _render_key(self, df, bands, dpi, columns=None, extra=()):
+        """Empreinte SHA-256 des entrées d'un rendu (données, bandes, style, résolution, code)
+        
+        Avec columns (un panneau), seules ces colonnes comptent : les panneaux
+        ne lisent pas la configuration, dont un changement n'invalide que les
+        panneaux des séries modifiées. Le tableau de bord entier dépend en plus
+        de la période (titre) et de la configuration.
+        """
+        import matplotlib
+        
+        digest = hashlib.sha256()
+        frame = df if columns is None else df[['Annee'] + columns]
+        digest.update(json.dumps([list(frame.columns), [str(dtype) for dtype in frame.dtypes]]).encode())
+        digest.update(np.ascontiguousarray(frame.to_numpy()).tobytes())
+        
+        if bands is not None:
+            if columns is not None:
+                bands = bands.loc[:, bands.columns.get_level_values(0).isin(columns)]
+            digest.update(json.dumps([list(map(list, bands.columns))]).encode())
+            digest.update(np.ascontiguousarray(bands.to_numpy()).tobytes())
+        
+        inputs = [self.collectivite, self.type, self.PLOT_STYLE, dpi, list(extra),
+                  code_version(), matplotlib.__version__]
+        if columns is None:
+            inputs += [self.start_year, self.end_year, self.config]
+        digest.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+    
+    def _read_cache_key(self, output_file):
+        """Clé du rendu qui a produit output_file (None si absent)"""
+        if not os.path.exists(output_file) or not os.path.exists(output_file + '.key'):
+            return None
+        with open(output_file + '.key', encoding='utf-8') as f:
+            return f.read().strip()
+    
+    def _write_cache_key(self, output_file, key):
+        """Enregistre la clé du rendu à côté du fichier produit"""
+        with open(output_file + '.key', 'w', encoding='utf-8') as f:
+            f.write(key)
+    
+    def _drop_cache_key(self, output_file):
+        """Supprime la clé d'un fichier réécrit sans passer par le cache"""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(output_file + '.key')
+    
+    def dashboard(self, df):
+        """Tableau de bord réutilisable (FinancialDashboard) affichant df
+        
+        Créé au premier appel puis mis à jour en place tant que la mise en
+        page (colonnes, nombre d'années) ne change pas.
+        """
+        if self._dashboard is not None and self._dashboard.accepts(df):
+            return self._dashboard.update(df)
+        if self._dashboard is not None:
+            self._dashboard.close()
+        self._dashboard = FinancialDashboard(self, df)
+        return self._dashboard
+    
+    def _render_dashboard(self, df, bands, output_file, show=True, dpi=300, tight=True):
+        """Rend le tableau de bord 4x2 dans une seule figure"""
+        with _style(self.PLOT_STYLE):
+            if show:
+                plt = _pyplot()
+                fig = plt.figure(figsize=(20, 24))
             else:
-                year_multiplier = 1.0
+                fig = _figure(figsize=(20, 24))
             
-            growth = 1 + 0.028 * i
-            noise = np.random.normal(1, 0.15)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
-    
-    # Méthodes d'investissement spécifiques à la Région
-    def _simulate_highschool_investment(self, dates):
-        """Simule l'investissement dans les lycées"""
-        base_investment = self.config["budget_base"] * 0.07
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2008, 2014, 2020]:
-                year_multiplier = 1.8
-            else:
-                year_multiplier = 1.0
+            for position, (panel, _) in enumerate(self.DASHBOARD_PANELS, start=1):
+                ax = fig.add_subplot(4, 2, position)
+                self._draw_panel(panel, df, ax, bands)
             
-            growth = 1 + 0.035 * i
-            noise = np.random.normal(1, 0.17)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+            fig.suptitle(self._dashboard_title(), fontsize=16, fontweight='bold')
+            with self._span('tight_layout', 'rendu'):
+                fig.tight_layout()
+            with self._span('savefig', 'rendu'):
+                fig.savefig(output_file, dpi=dpi, bbox_inches='tight' if tight else None)
+            if show:
+                plt.show()
+        
+        return output_file
     
-    def _simulate_training_investment(self, dates):
-        """Simule l'investissement dans la formation"""
-        base_investment = self.config["budget_base"] * 0.06
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2009, 2015, 2021]:
-                year_multiplier = 1.9
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.036 * i
-            noise = np.random.normal(1, 0.18)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+    def _dashboard_title(self):
+        """Titre général du tableau de bord"""
+        return f'Analyse des Comptes de {self.collectivite} - La Réunion ({self.start_year}-{self.end_year})'
     
-    def _simulate_transport_investment(self, dates):
-        """Simule l'investissement dans les transports"""
-        base_investment = self.config["budget_base"] * 0.08
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2007, 2013, 2019, 2024]:
-                year_multiplier = 2.0
+    def _draw_panel(self, panel, df, ax, bands=None):
+        """Dessine un panneau du tableau de bord sur l'axe donné"""
+        method = getattr(self, panel)
+        with self._span(f'plot:{panel}', 'rendu'):
+            if dict(self.DASHBOARD_PANELS)[panel]:
+                method(df, ax, bands)
             else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.04 * i
-            noise = np.random.normal(1, 0.20)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+                method(df, ax)
     
-    def _simulate_economy_investment(self, dates):
-        """Simule l'investissement dans l'économie"""
-        base_investment = self.config["budget_base"] * 0.05
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2010, 2016, 2022]:
-                year_multiplier = 1.7
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.033 * i
-            noise = np.random.normal(1, 0.16)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+    def _render_panel(self, panel, df, bands=None, dpi=300):
+        """Rend un panneau seul dans sa propre figure et retourne l'image RGBA
+        
+        Exécuté dans un processus de travail par _render_dashboard_parallel (via _render_panel_traced).
+        """
+        with _style(self.PLOT_STYLE):
+            fig = _figure(figsize=self.PANEL_SIZE, dpi=dpi)
+            self._draw_panel(panel, df, fig.add_subplot(), bands)
+            fig.tight_layout()
+            fig.canvas.draw()
+        return np.array(fig.canvas.buffer_rgba())
     
-    def _simulate_tourism_investment(self, dates):
-        """Simule l'investissement dans le tourisme"""
-        base_investment = self.config["budget_base"] * 0.04
-        
-        investment = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2011, 2017, 2023]:
-                year_multiplier = 1.8
-            else:
-                year_multiplier = 1.0
-            
-            growth = 1 + 0.035 * i
-            noise = np.random.normal(1, 0.19)
-            investment.append(base_investment * growth * year_multiplier * noise)
-        
-        return investment
+    def _render_panel_traced(self, panel, df, bands=None, dpi=300, profiler=None):
+        """_render_panel dans un processus de travail, avec ses spans
+        
+        Retourne (image, spans, pid) ; les spans sont fusionnés dans le
+        profiler du processus principal.
+        """
+        self.profiler = profiler
+        try:
+            image = self._render_panel(panel, df, bands, dpi)
+        finally:
+            if profiler is not None:
+                profiler.close()
+        return image, [] if profiler is None else profiler.events, os.getpid()
     
-    def _add_collectivite_trends(self, df):
-        """Ajoute des tendances réalistes adaptées à La Réunion"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Développement initial (2002-2005)
-            if 2002 <= year <= 2005:
-                if self.type == "departement":
-                    df.loc[i, 'Investissement_Action_Sociale'] *= 1.4
-                    df.loc[i, 'Investissement_Routes'] *= 1.5
-                else:
-                    df.loc[i, 'Investissement_Lycees'] *= 1.4
-                    df.loc[i, 'Investissement_Transport'] *= 1.6
-            
-            # Plan de développement réunionnais (2006-2010)
-            if 2006 <= year <= 2010:
-                df.loc[i, 'Dotations_Etat'] *= 1.12
-                df.loc[i, 'Fonds_Europeens'] *= 1.25
-                df.loc[i, 'Investissement'] *= 1.18
-            
-            # Impact de la crise financière (2008-2009)
-            if 2008 <= year <= 2009:
-                df.loc[i, 'Recettes_Totales'] *= 0.94
-                df.loc[i, 'Investissement'] *= 0.82
-            
-            # Développement du tourisme et des infrastructures (2011-2015)
-            elif 2011 <= year <= 2015:
-                if self.type == "departement":
-                    df.loc[i, 'Investissement_Sante'] *= 1.3
-                else:
-                    df.loc[i, 'Investissement_Tourisme'] *= 1.5
-                    df.loc[i, 'Investissement_Transport'] *= 1.4
-            
-            # Crise sociale de 2018 et plan de soutien
-            if year == 2018:
-                df.loc[i, 'Dotations_Etat'] *= 1.15
-                if self.type == "departement":
-                    df.loc[i, 'Investissement_Action_Sociale'] *= 1.4
-            
-            # Impact de la crise COVID-19 (2020-2021)
-            if 2020 <= year <= 2021:
-                if year == 2020:
-                    # Baisse des recettes mais soutien de l'État et de l'Europe
-                    df.loc[i, 'Autres_Recettes'] *= 0.75
-                    df.loc[i, 'Dotations_Etat'] *= 1.18
-                    df.loc[i, 'Fonds_Europeens'] *= 1.22
-            
-            # Plan de relance post-COVID spécifique aux DOM (2022-2025)
-            if year >= 2022:
-                df.loc[i, 'Investissement'] *= 1.16
-                if self.type == "departement":
-                    df.loc[i, 'Investissement_Sante'] *= 1.3
-                else:
-                    df.loc[i, 'Investissement_Economie'] *= 1.4
-                    df.loc[i, 'Investissement_Formation'] *= 1.35
+    def _render_title(self, dpi=300):
+        """Rend la bande de titre du tableau de bord assemblé"""
+        with _style(self.PLOT_STYLE):
+            fig = _figure(figsize=(2 * self.PANEL_SIZE[0], 0.6), dpi=dpi)
+            fig.text(0.5, 0.5, self._dashboard_title(), ha='center', va='center',
+                     fontsize=16, fontweight='bold')
+            fig.canvas.draw()
+        return np.array(fig.canvas.buffer_rgba())
     
-    def create_financial_analysis(self, df):
-        """Crée une analyse complète des finances de la collectivité"""
-        plt.style.use('seaborn-v0_8')
-        fig = plt.figure(figsize=(20, 24))
-        
-        # 1. Évolution des recettes et dépenses
-        ax1 = plt.subplot(4, 2, 1)
-        self._plot_revenue_expenses(df, ax1)
-        
-        # 2. Structure des recettes
-        ax2 = plt.subplot(4, 2, 2)
-        self._plot_revenue_structure(df, ax2)
-        
-        # 3. Structure des dépenses
-        ax3 = plt.subplot(4, 2, 3)
-        self._plot_expenses_structure(df, ax3)
-        
-        # 4. Investissements
-        ax4 = plt.subplot(4, 2, 4)
-        self._plot_investments(df, ax4)
-        
-        # 5. Dette et endettement
-        ax5 = plt.subplot(4, 2, 5)
-        self._plot_debt(df, ax5)
-        
-        # 6. Indicateurs de performance
-        ax6 = plt.subplot(4, 2, 6)
-        self._plot_performance_indicators(df, ax6)
-        
-        # 7. Démographie
-        ax7 = plt.subplot(4, 2, 7)
-        self._plot_demography(df, ax7)
-        
-        # 8. Investissements sectoriels
-        ax8 = plt.subplot(4, 2, 8)
-        self._plot_sectorial_investments(df, ax8)
+    def _render_dashboard_parallel(self, df, bands, stem, n_workers, output_format='png', dpi=300,
+                                   cache=True):
+        """Rend les huit panneaux en parallèle puis les assemble en PNG ou en PDF multipage
+        
+        Avec cache, chaque image de panneau est conservée (compressée) dans
+        .render_cache/ sous la clé de ses seules colonnes : seuls les panneaux
+        modifiés sont redessinés. Le dossier est un DatasetCache limité à
+        RENDER_CACHE_BYTES.
+        """
+        panels = [panel for panel, _ in self.DASHBOARD_PANELS]
+        
+        images = {}
+        if cache:
+            panel_cache = DatasetCache(os.path.join(os.path.dirname(stem), '.render_cache'),
+                                       self.RENDER_CACHE_BYTES)
+            cache_files = {
+                panel: panel_cache._path(self._render_key(df, bands, dpi, self._panel_columns(panel, df),
+                                                          extra=(panel,)))
+                for panel in panels
+            }
+            for panel, path in cache_files.items():
+                image = panel_cache._load(path, _read_panel_image)
+                if image is not None:
+                    images[panel] = image
+        missing = [panel for panel in panels if panel not in images]
+        
+        if n_workers > 1 and len(missing) > 1:
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(missing))) as executor:
+                futures = {panel: executor.submit(self._render_panel_traced, panel, df, bands, dpi, self.profiler)
+                           for panel in missing}
+                for panel, future in futures.items():
+                    images[panel], events, pid = future.result()
+                    if self.profiler is not None:
+                        self.profiler.merge(events, pid)
+        else:
+            images.update({panel: self._render_panel(panel, df, bands, dpi) for panel in missing})
         
-        plt.suptitle(f'Analyse des Comptes de {self.collectivite} - La Réunion ({self.start_year}-{self.end_year})', 
-                    fontsize=16, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig(f'{self.collectivite.replace(" ", "_")}_financial_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        if cache:
+            for panel in missing:
+                panel_cache._store(cache_files[panel], lambda f: np.savez_compressed(f, image=images[panel]))
         
-        # Générer les insights
-        self._generate_financial_insights(df)
+        return self._save_dashboard([images[panel] for panel in panels], stem, output_format, dpi)
+    
+    def _save_dashboard(self, images, stem, output_format='png', dpi=300):
+        """Assemble les images des panneaux (ordre de DASHBOARD_PANELS) en PNG ou en PDF multipage"""
+        if output_format == 'pdf':
+            # Une page par panneau, à la taille d'un panneau
+            from matplotlib.backends.backend_pdf import PdfPages
+            output_file = stem + '.pdf'
+            with PdfPages(output_file) as pdf:
+                for image in images:
+                    fig = _figure(figsize=self.PANEL_SIZE, dpi=dpi)
+                    fig.figimage(image)
+                    pdf.savefig(fig, dpi=dpi)
+            return output_file
+        
+        # Grille 4x2 sous la bande de titre (panneaux de taille identique)
+        rows = [np.concatenate(images[k:k + 2], axis=1) for k in range(0, len(images), 2)]
+        dashboard = np.concatenate([self._render_title(dpi)] + rows, axis=0)
+        output_file = stem + '.png'
+        with self._span('savefig', 'rendu'):
+            _imsave(output_file, dashboard, dpi=dpi)
+        return output_file
+    
+    def _record(self, artists, column):
+        """Note l'artiste (courbe ou série de barres) qui affiche une colonne
+        
+        Seulement pendant la construction d'un FinancialDashboard, qui met
+        ensuite ces artistes à jour en place. Retourne artists.
+        """
+        if self._recorded_artists is not None:
+            self._recorded_artists.append((artists, column))
+        return artists
+    
+    def _plot_band(self, ax, bands, column, color):
+        """Trace la bande d'une série entre ses percentiles extrêmes (P5-P95 par défaut)
+        
+        Les percentiles sont ceux des étiquettes "P..." présentes dans bands
+        (voir generate_ensemble) ; rien n'est tracé sans au moins deux percentiles.
+        """
+        if bands is None or column not in bands.columns.get_level_values(0):
+            return
+        labels = sorted(bands[column].columns, key=lambda label: float(label[1:]))
+        if len(labels) < 2:
+            return
+        ax.fill_between(bands.index, bands[(column, labels[0])], bands[(column, labels[-1])],
+                        color=color, alpha=0.2, linewidth=0)
     
-    def _plot_revenue_expenses(self, df, ax):
+    def _plot_revenue_expenses(self, df, ax, bands=None):
         """Plot de l'évolution des recettes et dépenses"""
-        ax.plot(df['Annee'], df['Recettes_Totales'], label='Recettes Totales', 
-               linewidth=2, color='#2A9D8F', alpha=0.8)
-        ax.plot(df['Annee'], df['Depenses_Totales'], label='Dépenses Totales', 
-               linewidth=2, color='#E76F51', alpha=0.8)
+        self._record(ax.plot(df['Annee'], df['Recettes_Totales'], label='Recettes Totales', 
+                            linewidth=2, color='#2A9D8F', alpha=0.8), 'Recettes_Totales')
+        self._record(ax.plot(df['Annee'], df['Depenses_Totales'], label='Dépenses Totales', 
+                            linewidth=2, color='#E76F51', alpha=0.8), 'Depenses_Totales')
+        self._plot_band(ax, bands, 'Recettes_Totales', '#2A9D8F')
+        self._plot_band(ax, bands, 'Depenses_Totales', '#E76F51')
         
         ax.set_title('Évolution des Recettes et Dépenses (M€)', 
                     fontsize=12, fontweight='bold')
@@ -681,7 +1253,7 @@ class ReunionCollectiviteFinanceAnalyzer:
         labels = ['Impôts Locaux', 'Dotations État', 'Fonds Européens', 'Autres Recettes']
         
         for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
+            self._record(ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i]), category)
             bottom += df[category]
         
         ax.set_title('Structure des Recettes (M€)', fontsize=12, fontweight='bold')
@@ -700,7 +1272,7 @@ class ReunionCollectiviteFinanceAnalyzer:
         labels = ['Fonctionnement', 'Investissement', 'Charge Dette', 'Personnel']
         
         for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
+            self._record(ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i]), category)
             bottom += df[category]
         
         ax.set_title('Structure des Dépenses (M€)', fontsize=12, fontweight='bold')
@@ -708,41 +1280,46 @@ class ReunionCollectiviteFinanceAnalyzer:
         ax.legend()
         ax.grid(True, alpha=0.3, axis='y')
     
-    def _plot_investments(self, df, ax):
+    def _plot_investments(self, df, ax, bands=None):
         """Plot des investissements"""
         if self.type == "departement":
-            ax.plot(df['Annee'], df['Investissement_Action_Sociale'], label='Action Sociale', 
-                   linewidth=2, color='#264653', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Education'], label='Éducation', 
-                   linewidth=2, color='#2A9D8F', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Routes'], label='Routes', 
-                   linewidth=2, color='#E76F51', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Sante'], label='Santé', 
-                   linewidth=2, color='#F9A602', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Culture'], label='Culture', 
-                   linewidth=2, color='#6A0572', alpha=0.8)
+            self._record(ax.plot(df['Annee'], df['Investissement_Action_Sociale'], label='Action Sociale', 
+                                linewidth=2, color='#264653', alpha=0.8), 'Investissement_Action_Sociale')
+            self._record(ax.plot(df['Annee'], df['Investissement_Education'], label='Éducation', 
+                                linewidth=2, color='#2A9D8F', alpha=0.8), 'Investissement_Education')
+            self._record(ax.plot(df['Annee'], df['Investissement_Routes'], label='Routes', 
+                                linewidth=2, color='#E76F51', alpha=0.8), 'Investissement_Routes')
+            self._record(ax.plot(df['Annee'], df['Investissement_Sante'], label='Santé', 
+                                linewidth=2, color='#F9A602', alpha=0.8), 'Investissement_Sante')
+            self._record(ax.plot(df['Annee'], df['Investissement_Culture'], label='Culture', 
+                                linewidth=2, color='#6A0572', alpha=0.8), 'Investissement_Culture')
         else:
-            ax.plot(df['Annee'], df['Investissement_Lycees'], label='Lycées', 
-                   linewidth=2, color='#264653', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Formation'], label='Formation', 
-                   linewidth=2, color='#2A9D8F', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Transport'], label='Transport', 
-                   linewidth=2, color='#E76F51', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Economie'], label='Économie', 
-                   linewidth=2, color='#F9A602', alpha=0.8)
-            ax.plot(df['Annee'], df['Investissement_Tourisme'], label='Tourisme', 
-                   linewidth=2, color='#6A0572', alpha=0.8)
+            self._record(ax.plot(df['Annee'], df['Investissement_Lycees'], label='Lycées', 
+                                linewidth=2, color='#264653', alpha=0.8), 'Investissement_Lycees')
+            self._record(ax.plot(df['Annee'], df['Investissement_Formation'], label='Formation', 
+                                linewidth=2, color='#2A9D8F', alpha=0.8), 'Investissement_Formation')
+            self._record(ax.plot(df['Annee'], df['Investissement_Transport'], label='Transport', 
+                                linewidth=2, color='#E76F51', alpha=0.8), 'Investissement_Transport')
+            self._record(ax.plot(df['Annee'], df['Investissement_Economie'], label='Économie', 
+                                linewidth=2, color='#F9A602', alpha=0.8), 'Investissement_Economie')
+            self._record(ax.plot(df['Annee'], df['Investissement_Tourisme'], label='Tourisme', 
+                                linewidth=2, color='#6A0572', alpha=0.8), 'Investissement_Tourisme')
+        
+        # Bandes d'ensemble, avec la couleur de chaque courbe
+        sector_columns = [c for c in df.columns if c.startswith('Investissement_')]
+        for column, line in zip(sector_columns, ax.get_lines()):
+            self._plot_band(ax, bands, column, line.get_color())
         
         ax.set_title('Répartition des Investissements (M€)', fontsize=12, fontweight='bold')
         ax.set_ylabel('Montants (M€)')
         ax.legend()
         ax.grid(True, alpha=0.3)
     
-    def _plot_debt(self, df, ax):
+    def _plot_debt(self, df, ax, bands=None):
         """Plot de la dette et du taux d'endettement"""
         # Dette totale
-        ax.bar(df['Annee'], df['Dette_Totale'], label='Dette Totale (M€)', 
-              color='#264653', alpha=0.7)
+        self._record(ax.bar(df['Annee'], df['Dette_Totale'], label='Dette Totale (M€)', 
+                           color='#264653', alpha=0.7), 'Dette_Totale')
         
         ax.set_title('Dette et Taux d\'Endettement', fontsize=12, fontweight='bold')
         ax.set_ylabel('Dette (M€)', color='#264653')
@@ -751,8 +1328,9 @@ class ReunionCollectiviteFinanceAnalyzer:
         
         # Taux d'endettement en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Taux_Endettement'], label='Taux d\'Endettement', 
-                linewidth=3, color='#E76F51')
+        self._record(ax2.plot(df['Annee'], df['Taux_Endettement'], label='Taux d\'Endettement', 
+                             linewidth=3, color='#E76F51'), 'Taux_Endettement')
+        self._plot_band(ax2, bands, 'Taux_Endettement', '#E76F51')
         ax2.set_ylabel('Taux d\'Endettement', color='#E76F51')
         ax2.tick_params(axis='y', labelcolor='#E76F51')
         
@@ -761,11 +1339,11 @@ class ReunionCollectiviteFinanceAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
-    def _plot_performance_indicators(self, df, ax):
+    def _plot_performance_indicators(self, df, ax, bands=None):
         """Plot des indicateurs de performance"""
         # Épargne brute
-        ax.bar(df['Annee'], df['Epargne_Brute'], label='Épargne Brute (M€)', 
-              color='#2A9D8F', alpha=0.7)
+        self._record(ax.bar(df['Annee'], df['Epargne_Brute'], label='Épargne Brute (M€)', 
+                           color='#2A9D8F', alpha=0.7), 'Epargne_Brute')
         
         ax.set_title('Indicateurs de Performance', fontsize=12, fontweight='bold')
         ax.set_ylabel('Épargne Brute (M€)', color='#2A9D8F')
@@ -774,8 +1352,9 @@ class ReunionCollectiviteFinanceAnalyzer:
         
         # Taux de fiscalité en second axe
         ax2 = ax.twinx()
-        ax2.plot(df['Annee'], df['Taux_Fiscalite'], label='Taux de Fiscalité', 
-                linewidth=3, color='#F9A602')
+        self._record(ax2.plot(df['Annee'], df['Taux_Fiscalite'], label='Taux de Fiscalité', 
+                             linewidth=3, color='#F9A602'), 'Taux_Fiscalite')
+        self._plot_band(ax2, bands, 'Taux_Fiscalite', '#F9A602')
         ax2.set_ylabel('Taux de Fiscalité', color='#F9A602')
         ax2.tick_params(axis='y', labelcolor='#F9A602')
         
@@ -784,10 +1363,11 @@ class ReunionCollectiviteFinanceAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
-    def _plot_demography(self, df, ax):
+    def _plot_demography(self, df, ax, bands=None):
         """Plot de l'évolution démographique"""
-        ax.plot(df['Annee'], df['Population'], label='Population', 
-               linewidth=2, color='#264653', alpha=0.8)
+        self._record(ax.plot(df['Annee'], df['Population'], label='Population', 
+                            linewidth=2, color='#264653', alpha=0.8), 'Population')
+        self._plot_band(ax, bands, 'Population', '#264653')
         
         ax.set_title('Évolution Démographique', fontsize=12, fontweight='bold')
         ax.set_ylabel('Population', color='#264653')
@@ -812,7 +1392,7 @@ class ReunionCollectiviteFinanceAnalyzer:
             labels = ['Lycées', 'Formation', 'Transport', 'Économie', 'Tourisme']
         
         for i, category in enumerate(categories):
-            ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i])
+            self._record(ax.bar(years, df[category], width, label=labels[i], bottom=bottom, color=colors[i]), category)
             bottom += df[category]
         
         ax.set_title('Répartition Sectorielle des Investissements (M€)', fontsize=12, fontweight='bold')
@@ -820,54 +1400,42 @@ class ReunionCollectiviteFinanceAnalyzer:
         ax.legend()
         ax.grid(True, alpha=0.3, axis='y')
     
-    def _generate_financial_insights(self, df):
-        """Génère des insights analytiques adaptés à La Réunion"""
+    def _generate_financial_insights(self, df, kpis=None):
+        """Génère des insights analytiques adaptés à La Réunion
+        
+        Couche texte au-dessus de compute_financial_kpis ; retourne les KPI
+        (Series) pour un usage programmatique.
+        """
+        if kpis is None:
+            kpis = compute_financial_kpis(df).iloc[0]
+        
         print(f"🏛️ INSIGHTS ANALYTIQUES - {self.collectivite} (La Réunion)")
         print("=" * 60)
         
         # 1. Statistiques de base
         print("\n1. 📈 STATISTIQUES GÉNÉRALES:")
-        avg_revenue = df['Recettes_Totales'].mean()
-        avg_expenses = df['Depenses_Totales'].mean()
-        avg_savings = df['Epargne_Brute'].mean()
-        avg_debt = df['Dette_Totale'].mean()
-        
-        print(f"Recettes moyennes annuelles: {avg_revenue:.2f} M€")
-        print(f"Dépenses moyennes annuelles: {avg_expenses:.2f} M€")
-        print(f"Épargne brute moyenne: {avg_savings:.2f} M€")
-        print(f"Dette moyenne: {avg_debt:.2f} M€")
+        print(f"Recettes moyennes annuelles: {kpis['recettes_moyennes']:.2f} M€")
+        print(f"Dépenses moyennes annuelles: {kpis['depenses_moyennes']:.2f} M€")
+        print(f"Épargne brute moyenne: {kpis['epargne_brute_moyenne']:.2f} M€")
+        print(f"Dette moyenne: {kpis['dette_moyenne']:.2f} M€")
         
         # 2. Croissance
         print("\n2. 📊 TAUX DE CROISSANCE:")
-        revenue_growth = ((df['Recettes_Totales'].iloc[-1] / 
-                          df['Recettes_Totales'].iloc[0]) - 1) * 100
-        population_growth = ((df['Population'].iloc[-1] / 
-                             df['Population'].iloc[0]) - 1) * 100
-        
-        print(f"Croissance des recettes ({self.start_year}-{self.end_year}): {revenue_growth:.1f}%")
-        print(f"Croissance de la population ({self.start_year}-{self.end_year}): {population_growth:.1f}%")
+        print(f"Croissance des recettes ({self.start_year}-{self.end_year}): {kpis['croissance_recettes_pct']:.1f}%")
+        print(f"Croissance de la population ({self.start_year}-{self.end_year}): {kpis['croissance_population_pct']:.1f}%")
         
         # 3. Structure financière (spécificités réunionnaises)
         print("\n3. 📋 STRUCTURE FINANCIÈRE:")
-        tax_share = (df['Impots_Locaux'].mean() / df['Recettes_Totales'].mean()) * 100
-        state_share = (df['Dotations_Etat'].mean() / df['Recettes_Totales'].mean()) * 100
-        europe_share = (df['Fonds_Europeens'].mean() / df['Recettes_Totales'].mean()) * 100
-        investment_share = (df['Investissement'].mean() / df['Depenses_Totales'].mean()) * 100
-        
-        print(f"Part des impôts locaux dans les recettes: {tax_share:.1f}%")
-        print(f"Part des dotations de l'État dans les recettes: {state_share:.1f}%")
-        print(f"Part des fonds européens dans les recettes: {europe_share:.1f}%")
-        print(f"Part de l'investissement dans les dépenses: {investment_share:.1f}%")
+        print(f"Part des impôts locaux dans les recettes: {kpis['part_impots_pct']:.1f}%")
+        print(f"Part des dotations de l'État dans les recettes: {kpis['part_dotations_pct']:.1f}%")
+        print(f"Part des fonds européens dans les recettes: {kpis['part_fonds_europeens_pct']:.1f}%")
+        print(f"Part de l'investissement dans les dépenses: {kpis['part_investissement_pct']:.1f}%")
         
         # 4. Dette et fiscalité
         print("\n4. 💰 ENDETTEMENT ET FISCALITÉ:")
-        avg_debt_ratio = df['Taux_Endettement'].mean() * 100
-        avg_tax_rate = df['Taux_Fiscalite'].mean()
-        last_debt_ratio = df['Taux_Endettement'].iloc[-1] * 100
-        
-        print(f"Taux d'endettement moyen: {avg_debt_ratio:.1f}%")
-        print(f"Taux d'endettement final: {last_debt_ratio:.1f}%")
-        print(f"Taux de fiscalité moyen: {avg_tax_rate:.2f}")
+        print(f"Taux d'endettement moyen: {kpis['taux_endettement_moyen_pct']:.1f}%")
+        print(f"Taux d'endettement final: {kpis['taux_endettement_final_pct']:.1f}%")
+        print(f"Taux de fiscalité moyen: {kpis['taux_fiscalite_moyen']:.2f}")
         
         # 5. Spécificités de la collectivité réunionnaise
         print(f"\n5. 🌟 SPÉCIFICITÉS DE {self.collectivite.upper()} (LA RÉUNION):")
@@ -900,6 +1468,1291 @@ class ReunionCollectiviteFinanceAnalyzer:
         print("• Développer les énergies renouvelables et l'autonomie énergétique")
         print("• Préserver la biodiversité unique de La Réunion")
         print("• Renforcer la coopération régionale dans l'océan Indien")
+        
+        return kpis
+
+# Nom par défaut de chaque type de collectivité
+COLLECTIVITES = {
+    "departement": "Département Réunion",
+    "region": "Région Réunion",
+}
+
+# Séries lues par le moteur de KPI
+KPI_COLUMNS = ('Recettes_Totales', 'Depenses_Totales', 'Epargne_Brute', 'Dette_Totale', 'Population',
+               'Impots_Locaux', 'Dotations_Etat', 'Fonds_Europeens', 'Investissement',
+               'Taux_Endettement', 'Taux_Fiscalite')
+
+# Définition de chaque KPI : (séries lues, formule sur les moyennes, premières et dernières valeurs)
+KPI_DEFINITIONS = {
+    'recettes_moyennes': (('Recettes_Totales',), lambda mean, first, last: mean['Recettes_Totales']),
+    'depenses_moyennes': (('Depenses_Totales',), lambda mean, first, last: mean['Depenses_Totales']),
+    'epargne_brute_moyenne': (('Epargne_Brute',), lambda mean, first, last: mean['Epargne_Brute']),
+    'dette_moyenne': (('Dette_Totale',), lambda mean, first, last: mean['Dette_Totale']),
+    'croissance_recettes_pct': (('Recettes_Totales',),
+                                lambda mean, first, last: (last['Recettes_Totales'] / first['Recettes_Totales'] - 1) * 100),
+    'croissance_population_pct': (('Population',),
+                                  lambda mean, first, last: (last['Population'] / first['Population'] - 1) * 100),
+    'part_impots_pct': (('Impots_Locaux', 'Recettes_Totales'),
+                        lambda mean, first, last: mean['Impots_Locaux'] / mean['Recettes_Totales'] * 100),
+    'part_dotations_pct': (('Dotations_Etat', 'Recettes_Totales'),
+                           lambda mean, first, last: mean['Dotations_Etat'] / mean['Recettes_Totales'] * 100),
+    'part_fonds_europeens_pct': (('Fonds_Europeens', 'Recettes_Totales'),
+                                 lambda mean, first, last: mean['Fonds_Europeens'] / mean['Recettes_Totales'] * 100),
+    'part_investissement_pct': (('Investissement', 'Depenses_Totales'),
+                                lambda mean, first, last: mean['Investissement'] / mean['Depenses_Totales'] * 100),
+    'taux_endettement_moyen_pct': (('Taux_Endettement',), lambda mean, first, last: mean['Taux_Endettement'] * 100),
+    'taux_endettement_final_pct': (('Taux_Endettement',), lambda mean, first, last: last['Taux_Endettement'] * 100),
+    'taux_fiscalite_moyen': (('Taux_Fiscalite',), lambda mean, first, last: mean['Taux_Fiscalite']),
+}
+
+def compute_kpis(values, series, names=None):
+    """Calcule les KPI en une passe sur un tableau (..., n_annees, n_series)
+    
+    Les axes de tête (réplicas, collectivités, points de grille...) sont
+    conservés : chaque KPI a la forme values.shape[:-2].
+    names: ne calculer que ces KPI (seules leurs séries sont lues)
+    Retourne {nom du KPI: tableau}.
+    """
+    names = list(KPI_DEFINITIONS) if names is None else list(names)
+    columns = [column for column in KPI_COLUMNS
+               if any(column in KPI_DEFINITIONS[name][0] for name in names)]
+    values = np.asarray(values)
+    positions = [list(series).index(column) for column in columns]
+    selected = values[..., positions]
+    
+    # Trois réductions pour toutes les séries : moyenne, première et dernière année
+    mean = dict(zip(columns, np.moveaxis(selected.mean(axis=-2), -1, 0)))
+    first = dict(zip(columns, np.moveaxis(selected[..., 0, :], -1, 0)))
+    last = dict(zip(columns, np.moveaxis(selected[..., -1, :], -1, 0)))
+    
+    return {name: KPI_DEFINITIONS[name][1](mean, first, last) for name in names}
+
+def compute_financial_kpis(data, series=None):
+    """KPI financiers sous forme de DataFrame (une ligne par scénario)
+    
+    data peut être:
+    - un DataFrame annuel large : une ligne ;
+    - le résultat de generate_ensemble() : une ligne par réplica ;
+    - un dictionnaire {nom: DataFrame} de collectivités sur la même période :
+      une ligne par collectivité ;
+    - un tableau (..., n_annees, n_series) avec la liste series : une ligne
+      par combinaison des axes de tête.
+    """
+    if isinstance(data, pd.DataFrame):
+        values, series, index = data[list(KPI_COLUMNS)].to_numpy()[None], KPI_COLUMNS, None
+    elif isinstance(data, dict) and 'valeurs' in data:
+        values, series = data['valeurs'], data['series']
+        index = pd.RangeIndex(len(values), name='Replica')
+    elif isinstance(data, dict):
+        values = np.stack([df[list(KPI_COLUMNS)].to_numpy() for df in data.values()])
+        series, index = KPI_COLUMNS, pd.Index(list(data), name='Collectivite')
+    else:
+        values, index = np.asarray(data), None
+    
+    kpis = compute_kpis(values, series)
+    return pd.DataFrame({name: np.ravel(kpi) for name, kpi in kpis.items()}, index=index)
+
+# Séries qui ne peuvent pas être négatives (l'épargne brute peut l'être)
+NONNEGATIVE_COLUMNS = tuple(column for column in ReunionCollectiviteFinanceAnalyzer.SERIES_STREAMS
+                            if column != 'Epargne_Brute')
+
+# Bornes des ratios (inclusives)
+RATIO_BOUNDS = {'Taux_Endettement': (0.0, 3.0), 'Taux_Fiscalite': (0.0, 2.0)}
+
+def _relative_gap(total, parts):
+    """Écart relatif entre un total et la somme de ses composantes"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.abs(total - sum(parts)) / np.abs(total)
+
+# Règles de cohérence comptable : (nature, séries lues, écart en fonction des séries)
+# "identite": violée si l'écart relatif dépasse la tolérance ; "borne": violée si l'écart est positif.
+# Une règle dont une série manque est ignorée.
+VALIDATION_RULES = {
+    'identite_recettes': ('identite', ('Recettes_Totales', 'Impots_Locaux', 'Dotations_Etat', 'Fonds_Europeens', 'Autres_Recettes'),
+                          lambda v: _relative_gap(v['Recettes_Totales'], (v['Impots_Locaux'], v['Dotations_Etat'],
+                                                                          v['Fonds_Europeens'], v['Autres_Recettes']))),
+    'identite_depenses': ('identite', ('Depenses_Totales', 'Fonctionnement', 'Investissement'),
+                          lambda v: _relative_gap(v['Depenses_Totales'], (v['Fonctionnement'], v['Investissement']))),
+    'personnel_fonctionnement': ('borne', ('Personnel', 'Fonctionnement'),
+                                 lambda v: v['Personnel'] - v['Fonctionnement']),
+    'charge_dette_fonctionnement': ('borne', ('Charge_Dette', 'Fonctionnement'),
+                                    lambda v: v['Charge_Dette'] - v['Fonctionnement']),
+    **{f'positif_{column}': ('borne', (column,), lambda v, column=column: -v[column])
+       for column in NONNEGATIVE_COLUMNS},
+    **{f'bornes_{column}': ('borne', (column,),
+                            lambda v, column=column, low=low, high=high: np.maximum(low - v[column], v[column] - high))
+       for column, (low, high) in RATIO_BOUNDS.items()},
+}
+
+def validate_financial_data(data, series=None, tolerance=0.01, rules=None):
+    """Vérifie la cohérence comptable de données annuelles ou infra-annuelles
+    
+    Chaque règle de VALIDATION_RULES est évaluée en une opération vectorisée
+    sur toutes les lignes (et tous les réplicas ou collectivités), ainsi qu'un
+    contrôle des valeurs non finies. data accepte les mêmes formes que
+    compute_financial_kpis (DataFrame, ensemble, {nom: DataFrame} même de
+    types ou de périodes différents, tableau (..., n_lignes, n_series) avec
+    series).
+    tolerance: écart relatif admis pour les identités
+    rules: ne vérifier que ces règles
+    Retourne un DataFrame d'une ligne par violation : règle, position
+    (Replica ou Collectivite, Ligne, Annee si disponible) et écart.
+    """
+    names = list(VALIDATION_RULES) if rules is None else list(rules)
+    unknown = sorted(set(names) - set(VALIDATION_RULES))
+    if unknown:
+        raise ValueError(f"Règles inconnues: {', '.join(unknown)}")
+    
+    if isinstance(data, dict) and 'valeurs' not in data:
+        # Collectivités de types (séries) ou de périodes différents : une validation par DataFrame
+        report = pd.concat([validate_financial_data(df, tolerance=tolerance, rules=names).assign(Collectivite=name)
+                            for name, df in data.items()], ignore_index=True)
+        return report[['Regle', 'Collectivite', *report.columns.drop(['Regle', 'Collectivite'])]]
+    
+    # Vues par série, de forme (..., n_lignes), sans copie des DataFrame
+    if isinstance(data, pd.DataFrame):
+        columns = {column: data[column].to_numpy() for column in data.columns}
+        axes, labels = [], []
+    elif isinstance(data, dict) and 'valeurs' in data:
+        columns = {column: data['valeurs'][..., k] for k, column in enumerate(data['series'])}
+        columns['Annee'] = np.broadcast_to(data['annees'], data['valeurs'].shape[:-1])
+        axes, labels = ['Replica'], [np.arange(len(data['valeurs']))]
+    else:
+        values = np.asarray(data)
+        columns = {column: values[..., k] for k, column in enumerate(series)}
+        axes = [f'Axe_{k}' for k in range(values.ndim - 2)]
+        labels = [np.arange(n) for n in values.shape[:-2]]
+    years = columns.pop('Annee', None)
+    
+    reports = []
+    
+    def report(name, gap, violations):
+        positions = np.nonzero(violations)
+        frame = {'Regle': name}
+        for axis, label, position in zip(axes, labels, positions):
+            frame[axis] = label[position]
+        frame['Ligne'] = positions[-1]
+        if years is not None:
+            frame['Annee'] = years[positions]
+        frame['Ecart'] = gap[positions]
+        reports.append(pd.DataFrame(frame))
+    
+    for name, column in columns.items():
+        if np.issubdtype(column.dtype, np.floating):
+            finite = np.isfinite(column)
+            if not finite.all():
+                report(f'fini_{name}', np.where(finite, 0.0, np.inf), ~finite)
+    
+    for name in names:
+        kind, needed, gap_function = VALIDATION_RULES[name]
+        if not all(column in columns for column in needed):
+            continue
+        gap = np.asarray(gap_function(columns), dtype=float)
+        violations = gap > (tolerance if kind == 'identite' else 0.0)
+        if violations.any():
+            report(name, gap, violations)
+    
+    if not reports:
+        return pd.DataFrame(columns=['Regle', *axes, 'Ligne', *(['Annee'] if years is not None else []), 'Ecart'])
+    return pd.concat(reports, ignore_index=True)
+
+class FinancialDashboard:
+    """Tableau de bord 4x2 réutilisable
+    
+    La figure, les axes (y compris les axes jumeaux), les courbes, les barres
+    et les légendes sont créés une seule fois. update() remplace ensuite les
+    données des artistes en place (set_data, set_height/set_y) et save()
+    enregistre la figure. La figure n'est pas enregistrée auprès de pyplot :
+    elle est libérée avec l'objet ou par close().
+    Les bandes d'ensemble ne sont pas gérées (voir create_financial_analysis).
+    """
+    
+    def __init__(self, analyzer, df):
+        self.analyzer = analyzer
+        self.columns = list(df.columns)
+        self.n_years = len(df)
+        self.closed = False
+        
+        with _style(analyzer.PLOT_STYLE):
+            self.figure = _figure(figsize=(20, 24))
+            analyzer._recorded_artists = recorded = []
+            try:
+                for position, (panel, _) in enumerate(analyzer.DASHBOARD_PANELS, start=1):
+                    analyzer._draw_panel(panel, df, self.figure.add_subplot(4, 2, position))
+            finally:
+                analyzer._recorded_artists = None
+            self.title = self.figure.suptitle(analyzer._dashboard_title(), fontsize=16, fontweight='bold')
+            with analyzer._span('tight_layout', 'rendu'):
+                self.figure.tight_layout()
+        
+        self.bindings = self._bind(recorded)
+    
+    def _bind(self, recorded):
+        """Associe chaque courbe et chaque série de barres à la colonne qu'elle affiche
+        
+        recorded: (artistes, colonne) notés par analyzer._record pendant le tracé.
+        Retourne une liste de (genre, axe, artiste, colonne, colonnes empilées dessous).
+        """
+        bindings = []
+        stacked = {}
+        for artists, column in recorded:
+            if isinstance(artists, list):
+                # ax.plot : une courbe par appel
+                bindings.append(('courbe', artists[0].axes, artists[0], column, []))
+                continue
+            # Barres empilées dans l'ordre de tracé : chaque série repose sur les précédentes de son axe
+            ax = artists.patches[0].axes
+            below = stacked.setdefault(ax, [])
+            bindings.append(('barres', ax, artists, column, list(below)))
+            below.append(column)
+        return bindings
+    
+    def accepts(self, df):
+        """Vrai si df a la mise en page de ce tableau de bord (mêmes colonnes, même nombre d'années)
+        
+        Toujours faux une fois le tableau de bord fermé.
+        """
+        return not self.closed and list(df.columns) == self.columns and len(df) == self.n_years
+    
+    def update(self, df):
+        """Remplace les données affichées par celles de df, sans recréer d'artiste"""
+        if self.closed:
+            raise ValueError("Tableau de bord fermé")
+        if not self.accepts(df):
+            raise ValueError("Mise en page différente : colonnes ou nombre d'années modifiés")
+        
+        years = df['Annee'].to_numpy()
+        for kind, ax, artist, column, below in self.bindings:
+            values = df[column].to_numpy()
+            if kind == 'courbe':
+                artist.set_data(years, values)
+                continue
+            bottom = np.zeros(len(years))
+            for other in below:
+                bottom = bottom + df[other].to_numpy()
+            for patch, year, height, base in zip(artist, years, values, bottom):
+                patch.set_x(year - patch.get_width() / 2)
+                patch.set_height(height)
+                patch.set_y(base)
+                # Bord « collant » de l'autoscale : le bas de la barre (comme Axes.bar)
+                patch.sticky_edges.y[:] = [base]
+        
+        for ax in self.figure.axes:
+            ax.relim()
+            ax.autoscale_view()
+        self.title.set_text(self.analyzer._dashboard_title())
+        
+        # Les étiquettes des graduations changent de largeur avec les données
+        with _style(self.analyzer.PLOT_STYLE), self.analyzer._span('tight_layout', 'rendu'):
+            self.figure.tight_layout()
+        return self
+    
+    def save(self, output_file, dpi=300, tight=True):
+        """Enregistre la figure (format déduit de l'extension, recadrage serré si tight)"""
+        if self.closed:
+            raise ValueError("Tableau de bord fermé")
+        self.analyzer._drop_cache_key(output_file)
+        with _style(self.analyzer.PLOT_STYLE), self.analyzer._span('savefig', 'rendu'):
+            self.figure.savefig(output_file, dpi=dpi, bbox_inches='tight' if tight else None)
+        return output_file
+    
+    def close(self):
+        """Libère la figure et ses artistes (l'analyseur en recréera un au prochain rendu)"""
+        self.figure.clear()
+        self.bindings = []
+        self.closed = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ScenarioSession:
+    """Session « et si ? » à recalcul incrémental
+    
+    Conserve les séries, les KPI et les images des panneaux d'une
+    réalisation annuelle (réplica 0). update() ne recalcule que ce qui dépend
+    des paramètres modifiés (voir dependency_graph) : chaque série ayant son
+    propre flux aléatoire, une série recalculée seule est identique à celle
+    d'une génération complète.
+    """
+    
+    def __init__(self, analyzer, output_dir=None, render=True, dpi=150):
+        self.analyzer = analyzer
+        self.output_dir = output_dir
+        self.render = render
+        self.dpi = dpi
+        self.years = np.arange(analyzer.start_year, analyzer.end_year + 1)
+        
+        series, values = analyzer._simulate_kernel(self.years)
+        values = analyzer._apply_trends(values, series, self.years)
+        self.df = pd.DataFrame({'Annee': self.years, **dict(zip(series, values.T))})
+        self.kpis = compute_kpis(values, series)
+        
+        self.panels = {}
+        if render:
+            for panel, _ in analyzer.DASHBOARD_PANELS:
+                self.panels[panel] = analyzer._render_panel(panel, self.df, dpi=dpi)
+        self.output_file = self._save()
+    
+    def parameter(self, name):
+        """Valeur courante d'un paramètre"""
+        config = self.analyzer.config
+        return config[name] if name in ('budget_base', 'population_base') else config["parametres"][name]
+    
+    def update(self, **parameters):
+        """Change des paramètres et recalcule uniquement les séries, KPI et panneaux concernés
+        
+        Retourne {"series": [...], "kpis": [...], "panneaux": [...]} : ce qui a
+        été recalculé.
+        """
+        analyzer = self.analyzer
+        config = analyzer._with_parameters(parameters)
+        changed = [name for name, value in parameters.items() if value != self.parameter(name)]
+        analyzer.config = config
+        
+        affected = analyzer.affected_by(changed, self.df)
+        if not affected["series"]:
+            return affected
+        
+        with analyzer._span('session:series', 'simulation'):
+            series, values = analyzer._simulate_kernel(self.years, columns=affected["series"])
+            values = analyzer._apply_trends(values, series, self.years)
+            for column, column_values in zip(series, values.T):
+                self.df[column] = column_values
+        
+        with analyzer._span('session:kpis', 'analyse'):
+            self.kpis.update(compute_kpis(self.df[list(KPI_COLUMNS)].to_numpy(), KPI_COLUMNS,
+                                          names=affected["kpis"]))
+        
+        if self.render and affected["panneaux"]:
+            with analyzer._span('session:panneaux', 'rendu'):
+                for panel in affected["panneaux"]:
+                    self.panels[panel] = analyzer._render_panel(panel, self.df, dpi=self.dpi)
+            self.output_file = self._save()
+        
+        return affected
+    
+    def _save(self):
+        """Assemble le tableau de bord si un dossier de sortie est donné"""
+        if self.output_dir is None or not self.render:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        stem = os.path.join(self.output_dir, f'{self.analyzer.collectivite.replace(" ", "_")}_financial_analysis')
+        images = [self.panels[panel] for panel, _ in self.analyzer.DASHBOARD_PANELS]
+        self.analyzer._drop_cache_key(stem + '.png')
+        return self.analyzer._save_dashboard(images, stem, 'png', self.dpi)
+
+# Colonnes d'identification (tout le reste est une série numérique)
+ID_COLUMNS = ('Collectivite', 'Replica', 'Annee', 'Trimestre', 'Mois')
+
+# Types compacts des colonnes d'identification
+COMPACT_ID_DTYPES = {
+    'Annee': np.int16,
+    'Trimestre': np.int8,
+    'Mois': np.int8,
+    'Replica': np.int32,
+}
+
+def to_compact(df):
+    """Version compacte d'un DataFrame large : années int16, montants et taux float32
+    
+    Divise environ par deux la mémoire des séries, au prix de la précision
+    float32 (7 chiffres significatifs, suffisant pour des M€ et des taux).
+    """
+    data = {}
+    for column in df.columns:
+        if column in COMPACT_ID_DTYPES:
+            data[column] = df[column].to_numpy().astype(COMPACT_ID_DTYPES[column])
+        elif column == 'Collectivite':
+            data[column] = df[column].astype('category')
+        else:
+            data[column] = df[column].to_numpy().astype(np.float32)
+    return pd.DataFrame(data, copy=False)
+
+def to_long(df):
+    """Format long (tidy) : colonnes d'identification, "Serie" (catégorielle), "Valeur" (float32)
+    
+    Les collectivités de types différents (secteurs d'investissement
+    distincts) peuvent ainsi être empilées sans colonnes vides.
+    """
+    ids = [column for column in df.columns if column in ID_COLUMNS]
+    series = [column for column in df.columns if column not in ID_COLUMNS]
+    n_rows, n_series = len(df), len(series)
+    
+    data = {column: np.repeat(to_compact(df[[column]])[column].to_numpy(), n_series) for column in ids}
+    data['Serie'] = pd.Categorical.from_codes(np.tile(np.arange(n_series), n_rows), categories=series)
+    data['Valeur'] = df[series].to_numpy(dtype=np.float32).ravel()
+    return pd.DataFrame(data, copy=False)
+
+def to_wide(long_df, dtype=np.float64):
+    """Retour au format large depuis to_long (une colonne par série, ordre des catégories)"""
+    # Identifiants vides dans ce sous-ensemble (ex. "Mois" d'un panel mixte) ignorés
+    ids = [column for column in long_df.columns if column in ID_COLUMNS and long_df[column].notna().any()]
+    wide = long_df.set_index(ids + ['Serie'])['Valeur'].unstack('Serie')
+    # Séries absentes de ce sous-ensemble (autre type de collectivité) : colonnes vides retirées
+    wide = wide.dropna(axis=1, how='all').astype(dtype).reset_index()
+    wide.columns.name = None
+    for column in ids:
+        if column in COMPACT_ID_DTYPES:
+            wide[column] = wide[column].astype(np.int64)
+    return wide
+
+def stack_collectivites(frames):
+    """Empile les données de plusieurs collectivités ({nom: DataFrame}) en un panel long compact"""
+    stacked = []
+    for name, df in frames.items():
+        long_df = to_long(df)
+        long_df.insert(0, 'Collectivite', name)
+        stacked.append(long_df)
+    panel = pd.concat(stacked, ignore_index=True)
+    panel['Collectivite'] = panel['Collectivite'].astype('category')
+    # Catégories des séries dans l'ordre d'apparition des colonnes
+    series = dict.fromkeys(c for df in frames.values() for c in df.columns if c not in ID_COLUMNS)
+    panel['Serie'] = pd.Categorical(panel['Serie'], categories=list(series))
+    return panel
+
+# Écriture et relecture des données générées, par format
+def _write_csv(df, path):
+    df.to_csv(path, index=False)
+
+def _read_csv(path, mmap=True):
+    return pd.read_csv(path)
+
+def _write_parquet(df, path):
+    df.to_parquet(path, index=False)
+
+def _read_parquet(path, mmap=True):
+    return pd.read_parquet(path, memory_map=mmap)
+
+def _write_feather(df, path):
+    # Non compressé pour pouvoir être projeté en mémoire à la relecture
+    df.to_feather(path, compression='uncompressed')
+
+def _read_feather(path, mmap=True):
+    from pyarrow import feather
+    return feather.read_table(path, memory_map=mmap).to_pandas()
+
+# Suffixe des catégories d'une colonne catégorielle en npz/npy (la colonne porte les codes)
+CATEGORIES_SUFFIX = '.categories'
+
+def _numpy_columns(df):
+    """Colonnes de df en tableaux NumPy relisibles sans pickle
+    
+    Une colonne catégorielle (Serie, Collectivite du format long) devient
+    ses codes entiers plus le tableau de ses catégories.
+    Retourne {nom: tableau}.
+    """
+    objects = [column for column in df.columns
+               if df[column].dtype.kind not in 'biuf' and not isinstance(df[column].dtype, pd.CategoricalDtype)]
+    if objects:
+        raise ValueError(f"Colonnes non numériques non prises en charge en npz/npy "
+                         f"(convertir en catégorielles): {', '.join(map(str, objects))}")
+    
+    arrays = {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = values.cat.categories.to_numpy()
+            arrays[column] = values.cat.codes.to_numpy()
+            arrays[column + CATEGORIES_SUFFIX] = categories.astype(str) if categories.dtype == object else categories
+        else:
+            arrays[column] = np.ascontiguousarray(values.to_numpy())
+    return arrays
+
+def _from_codes(codes, categories):
+    return pd.Categorical.from_codes(np.asarray(codes), categories=categories)
+
+def _write_npz(df, path):
+    np.savez(path, **_numpy_columns(df))
+
+def _read_npz(path, mmap=True):
+    with np.load(path) as arrays:
+        names = [name for name in arrays.files if not name.endswith(CATEGORIES_SUFFIX)]
+        return pd.DataFrame({
+            name: (_from_codes(arrays[name], arrays[name + CATEGORIES_SUFFIX])
+                   if name + CATEGORIES_SUFFIX in arrays.files else arrays[name])
+            for name in names
+        }, copy=False)
+
+def _write_npy(df, path):
+    # Un fichier .npy contigu par colonne (et par tableau de catégories), plus l'ordre des colonnes
+    arrays = _numpy_columns(df)
+    os.makedirs(path, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(path, f'{name}.npy'), values)
+    with open(os.path.join(path, 'colonnes.json'), 'w', encoding='utf-8') as f:
+        json.dump(list(df.columns), f)
+
+def _read_npy(path, mmap=True):
+    with open(os.path.join(path, 'colonnes.json'), encoding='utf-8') as f:
+        columns = json.load(f)
+    mmap_mode = 'r' if mmap else None
+    data = {}
+    for column in columns:
+        values = np.load(os.path.join(path, f'{column}.npy'), mmap_mode=mmap_mode)
+        categories = os.path.join(path, f'{column}{CATEGORIES_SUFFIX}.npy')
+        data[column] = _from_codes(values, np.load(categories)) if os.path.exists(categories) else values
+    return pd.DataFrame(data, copy=False)
+
+# Formats de données : nom -> (suffixe du fichier, écriture, lecture)
+# Parquet et Feather nécessitent pyarrow ; "npy" est un dossier de colonnes projetables en mémoire.
+DATA_FORMATS = {
+    'csv': ('.csv', _write_csv, _read_csv),
+    'parquet': ('.parquet', _write_parquet, _read_parquet),
+    'feather': ('.feather', _write_feather, _read_feather),
+    'npz': ('.npz', _write_npz, _read_npz),
+    'npy': ('_npy', _write_npy, _read_npy),
+}
+
+def _read_panel_image(path):
+    """Image RGBA d'un panneau du cache de rendu"""
+    with np.load(path) as arrays:
+        return arrays['image']
+
+def write_financial_data(df, stem, fmt='csv'):
+    """Écrit les données au format demandé et retourne le chemin produit (stem + suffixe)"""
+    suffix, writer, _ = DATA_FORMATS[fmt]
+    path = stem + suffix
+    writer(df, path)
+    return path
+
+def read_financial_data(path, mmap=True):
+    """Relit des données écrites par write_financial_data (format déduit du suffixe)
+    
+    mmap: projeter le fichier en mémoire quand le format le permet (npy, feather,
+    parquet), ce qui évite de recopier les colonnes numériques.
+    """
+    for suffix, _, reader in DATA_FORMATS.values():
+        if path.rstrip('/\\').endswith(suffix):
+            return reader(path.rstrip('/\\'), mmap=mmap)
+    raise ValueError(f"Format de données non reconnu: {path}")
+
+# Sorties disponibles en mode sans interaction
+OUTPUT_FORMATS = tuple(DATA_FORMATS) + ('png', 'pdf')
+
+_BACKGROUND_EXECUTOR = None
+
+def _background_executor():
+    """Processus unique des rendus d'arrière-plan, créé au premier besoin"""
+    global _BACKGROUND_EXECUTOR
+    if _BACKGROUND_EXECUTOR is None:
+        # Rendus hors écran par _figure/_imsave : pas de backend à imposer (ni ici ni au processus)
+        _BACKGROUND_EXECUTOR = ProcessPoolExecutor(max_workers=1)
+    return _BACKGROUND_EXECUTOR
+
+def code_version():
+    """Empreinte du code source de ce module (invalide les caches quand le code change)"""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        with open(os.path.abspath(__file__), 'rb') as f:
+            _CODE_VERSION = hashlib.sha256(f.read()).hexdigest()[:16]
+    return _CODE_VERSION
+
+_CODE_VERSION = None
+
+class DatasetCache:
+    """Cache disque des données générées et des ensembles Monte Carlo
+    
+    Chaque entrée est un fichier .npz nommé par l'empreinte SHA-256 des
+    entrées de la génération (collectivité, type, graine, période,
+    configuration, options) et de la version du code. Au-delà de max_bytes,
+    les entrées les moins récemment utilisées sont supprimées (la date de
+    modification est mise à jour à chaque lecture).
+    Un analyseur sans graine contourne le cache : son entrée ne serait
+    jamais relue et évincerait des entrées valides.
+    """
+    
+    def __init__(self, directory='.dataset_cache', max_bytes=512 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+    
+    def key(self, analyzer, kind, **options):
+        """Empreinte des entrées d'une génération"""
+        payload = [analyzer.collectivite, analyzer.type, analyzer.seed, analyzer.seed_sequence.spawn_key,
+                   analyzer.start_year, analyzer.end_year, analyzer.config, kind, options, code_version()]
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def financial_data(self, analyzer, freq='A', compact=False):
+        """generate_financial_data() servi depuis le cache si possible"""
+        if not analyzer.seeded:
+            return analyzer.generate_financial_data(freq, compact)
+        path = self._path(self.key(analyzer, 'donnees', freq=freq, compact=compact))
+        df = self._load(path, _read_npz)
+        if df is not None:
+            print(f"♻️ Données en cache pour {analyzer.collectivite}")
+            return df
+        
+        df = analyzer.generate_financial_data(freq, compact)
+        self._store(path, lambda f: _write_npz(df, f))
+        return df
+    
+    def ensemble(self, analyzer, n_replicas=1000, percentiles=(5, 50, 95), n_workers=None, compact=False):
+        """generate_ensemble() servi depuis le cache si possible (résultat indépendant de n_workers)"""
+        if not analyzer.seeded:
+            return analyzer.generate_ensemble(n_replicas, percentiles, n_workers, compact)
+        path = self._path(self.key(analyzer, 'ensemble', n_replicas=n_replicas,
+                                   percentiles=list(percentiles), compact=compact))
+        ensemble = self._load(path, self._read_ensemble)
+        if ensemble is not None:
+            print(f"♻️ Ensemble de {n_replicas} réalisations en cache pour {analyzer.collectivite}")
+            return ensemble
+        
+        ensemble = analyzer.generate_ensemble(n_replicas, percentiles, n_workers, compact)
+        bands = ensemble["bandes"]
+        self._store(path, lambda f: np.savez(
+            f, annees=ensemble["annees"], series=np.array(ensemble["series"]), valeurs=ensemble["valeurs"],
+            bandes=bands.to_numpy(),
+            etiquettes=np.array(list(bands.columns.get_level_values(1)[:len(percentiles)]), dtype=str)
+        ))
+        return ensemble
+    
+    def stats(self):
+        """Compteurs de succès et d'échecs, nombre d'entrées et taille du cache"""
+        entries = self._entries()
+        return {"hits": self.hits, "misses": self.misses, "entrees": len(entries),
+                "octets": sum(size for _, size, _ in entries)}
+    
+    def clear(self):
+        """Supprime toutes les entrées"""
+        for path, _, _ in self._entries():
+            os.remove(path)
+    
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+    
+    def _read_ensemble(self, path):
+        with np.load(path) as arrays:
+            series = [str(column) for column in arrays["series"]]
+            return {
+                "annees": arrays["annees"],
+                "series": series,
+                "valeurs": arrays["valeurs"],
+                "bandes": pd.DataFrame(
+                    arrays["bandes"],
+                    index=pd.Index(arrays["annees"], name='Annee'),
+                    columns=pd.MultiIndex.from_product([series, [str(label) for label in arrays["etiquettes"]]])
+                ),
+            }
+    
+    def _load(self, path, reader):
+        """Lit une entrée (None si absente ou illisible) et la marque comme récemment utilisée
+        
+        Une entrée illisible (tronquée, corrompue) est supprimée.
+        """
+        try:
+            value = reader(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            self.misses += 1
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            return None
+        os.utime(path)
+        self.hits += 1
+        return value
+    
+    def _store(self, path, writer):
+        """Écrit une entrée (fichier temporaire puis renommage atomique) et applique la limite de taille"""
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            writer(f)
+        os.replace(tmp_path, path)
+        self._evict()
+    
+    def _entries(self):
+        """(chemin, taille, date de dernière utilisation) de chaque entrée"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total -= size
+
+def _fit_ets(values):
+    """Ajuste un lissage exponentiel à tendance additive (statsmodels) sur une série
+    
+    Retourne le résultat de l'ajustement (projeté par _project_ets).
+    """
+    from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return ETSModel(pd.Series(values, dtype=float), error='add', trend='add').fit(disp=False)
+
+def _project_ets(results, horizon, level):
+    """(prévision, borne basse, borne haute) d'un ajustement ETS, chacune de longueur horizon"""
+    nobs = int(results.nobs)
+    frame = results.get_prediction(start=nobs, end=nobs + horizon - 1).summary_frame(alpha=1 - level)
+    return frame['mean'].to_numpy(), frame['pi_lower'].to_numpy(), frame['pi_upper'].to_numpy()
+
+class SeriesForecaster:
+    """Projection des séries annuelles au-delà de la dernière année, avec intervalles de prévision
+    
+    method "ols": tendance linéaire ajustée par moindres carrés sur toutes les
+    séries (et toutes les collectivités) à la fois, intervalle de Student.
+    method "ets": lissage exponentiel de statsmodels, un ajustement par série
+    réparti sur n_workers processus.
+    Les ajustements (pas les projections) sont mis en cache par contenu de
+    série, dans la limite de cache_size séries (LRU) : une mise à jour ne
+    réajuste que les séries modifiées, quel que soit l'horizon demandé.
+    """
+    
+    LABELS = ('prevision', 'bas', 'haut')
+    
+    def __init__(self, method='ols', level=0.95, n_workers=None, cache_size=4096):
+        if method not in ('ols', 'ets'):
+            raise ValueError(f"Méthode de prévision inconnue: {method}")
+        self.method = method
+        self.level = level
+        self.n_workers = n_workers
+        self.cache_size = cache_size
+        self._fits = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def forecast(self, data, horizon=10):
+        """Projette chaque série de horizon années
+        
+        data: DataFrame annuel large (colonne Annee + séries) ou dictionnaire
+        {nom: DataFrame} de collectivités.
+        Retourne un DataFrame indexé par année, colonnes (série,
+        "prevision"/"bas"/"haut"), ou un dictionnaire de tels DataFrames.
+        """
+        frames = data if isinstance(data, dict) else {None: data}
+        
+        # Une tâche par (collectivité, série), identifiée par le contenu de la série
+        tasks = {}
+        for name, df in frames.items():
+            years = df['Annee'].to_numpy()
+            for column in df.columns.drop('Annee'):
+                values = df[column].to_numpy(dtype=float)
+                digest = hashlib.sha256(values.tobytes() + years.tobytes()).hexdigest()
+                tasks[(name, column)] = ((self.method, digest), years, values)
+        
+        missing = {key: task for key, task in tasks.items() if task[0] not in self._fits}
+        fitted = len({task[0] for task in missing.values()})
+        self.misses += fitted
+        self.hits += len(tasks) - fitted
+        self._fit(missing)
+        
+        results = {}
+        for name, df in frames.items():
+            future = np.arange(df['Annee'].iloc[-1] + 1, df['Annee'].iloc[-1] + 1 + horizon)
+            columns = list(df.columns.drop('Annee'))
+            fits = [self._fits[tasks[(name, column)][0]] for column in columns]
+            projection = self._project(fits, horizon)                         # (horizon, n_series, 3)
+            results[name] = pd.DataFrame(
+                projection.reshape(horizon, -1),
+                index=pd.Index(future, name='Annee'),
+                columns=pd.MultiIndex.from_product([columns, self.LABELS])
+            )
+        
+        # Ajustements utilisés gardés en dernier, les moins récents évincés au-delà de cache_size
+        for cache_key, _, _ in tasks.values():
+            self._fits.move_to_end(cache_key)
+        while len(self._fits) > self.cache_size:
+            self._fits.popitem(last=False)
+        return results if isinstance(data, dict) else results[None]
+    
+    def _fit(self, tasks):
+        """Ajuste les séries absentes du cache"""
+        if not tasks:
+            return
+        if self.method == 'ols':
+            self._fit_ols(tasks)
+            return
+        
+        keys = list(tasks)
+        values = [tasks[key][2] for key in keys]
+        if self.n_workers is not None and self.n_workers > 1 and len(keys) > 1:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                fits = list(executor.map(_fit_ets, values, chunksize=max(1, len(keys) // (4 * self.n_workers))))
+        else:
+            fits = list(map(_fit_ets, values))
+        for key, fit in zip(keys, fits):
+            self._fits[tasks[key][0]] = fit
+    
+    def _fit_ols(self, tasks):
+        """Tendances linéaires de toutes les séries d'une même période en un seul calcul
+        
+        Chaque ajustement est (ordonnée, pente, écart-type résiduel, années).
+        """
+        groups = {}
+        for cache_key, years, values in tasks.values():
+            groups.setdefault(years.tobytes(), (years, {}))[1][cache_key] = values
+        
+        for years, series in groups.values():
+            n = len(years)
+            if n < 3:
+                raise ValueError("Au moins trois années sont nécessaires pour une prévision")
+            t = years - years.mean()
+            design = np.column_stack([np.ones(n), t])
+            values = np.column_stack(list(series.values()))                   # (n, n_series)
+            coefficients, *_ = np.linalg.lstsq(design, values, rcond=None)    # (2, n_series)
+            residuals = values - design @ coefficients
+            sigma = np.sqrt((residuals ** 2).sum(axis=0) / (n - 2))
+            for k, cache_key in enumerate(series):
+                self._fits[cache_key] = (coefficients[0, k], coefficients[1, k], sigma[k], years)
+    
+    def _project(self, fits, horizon):
+        """Projections des ajustements d'une collectivité : tableau (horizon, n_series, 3)"""
+        if self.method == 'ets':
+            return np.stack([np.stack(_project_ets(fit, horizon, self.level), axis=-1) for fit in fits], axis=1)
+        
+        from scipy import stats
+        
+        # Séries d'une même collectivité : mêmes années, projetées en un seul calcul
+        intercept, slope, sigma = (np.array([fit[k] for fit in fits]) for k in range(3))
+        years = fits[0][3]
+        n = len(years)
+        t = years - years.mean()
+        future = (years[-1] + np.arange(1, horizon + 1) - years.mean())[:, None]
+        mean = intercept + slope * future                                     # (horizon, n_series)
+        spread = stats.t.ppf((1 + self.level) / 2, n - 2) * sigma * np.sqrt(
+            1 + 1 / n + future ** 2 / (t ** 2).sum()
+        )
+        return np.stack([mean, mean - spread, mean + spread], axis=-1)
+    
+    def stats(self):
+        """Compteurs du cache d'ajustements"""
+        return {"hits": self.hits, "misses": self.misses, "ajustements": len(self._fits)}
+
+def analyze_collectivite(collectivite_name, collectivite_type, output_dir='.', seed=None,
+                         start_year=2002, end_year=2025, formats=('csv', 'png'), render_workers=None,
+                         freq='A', trace=None, profile_memory=False, cache_dir=None, cache_size=512 * 2**20,
+                         quality='impression', full_quality=False, forecast=0, forecast_method='ols',
+                         validate=False):
+    """Analyse complète d'une collectivité sans interaction (génération, CSV, graphiques)
+    
+    Fonction de niveau module pour pouvoir être exécutée dans un processus de travail.
+    formats: sorties à produire parmi les formats de données de DATA_FORMATS
+    (csv, parquet, feather, npz, npy), "png" (tableau de bord) et "pdf" (un
+    panneau par page)
+    render_workers: nombre de processus pour le rendu parallèle des panneaux
+    freq: résolution des données exportées ("A", "Q" ou "M") ; le tableau de
+    bord reste annuel
+    trace: chemin d'une trace d'exécution (format Chrome si le nom finit par
+    ".trace.json", sinon liste JSON des spans) ; profile_memory y ajoute les
+    allocations de chaque span
+    cache_dir: dossier d'un DatasetCache (limité à cache_size octets) ; utilisé
+    seulement avec une graine, sans laquelle les données ne se répètent pas
+    quality: niveau de qualité du tableau de bord "png" (voir RENDER_QUALITIES) ;
+    full_quality: produire ensuite la version d'impression, après l'aperçu
+    forecast: nombre d'années projetées après end_year (CSV de prévisions avec
+    intervalles, voir SeriesForecaster) ; 0 pour aucune prévision
+    validate: vérifier la cohérence comptable des données exportées
+    (validate_financial_data) et écrire les violations dans un CSV
+    Retourne un dictionnaire avec les fichiers produits et la durée de chaque étape.
+    """
+    # Mode sans affichage : rendu hors écran (Agg), figures fermées après enregistrement
+    os.makedirs(output_dir, exist_ok=True)
+    timings = {}
+    files = []
+    
+    start = time.perf_counter()
+    analyzer = ReunionCollectiviteFinanceAnalyzer(collectivite_name, collectivite_type, seed=seed,
+                                                  start_year=start_year, end_year=end_year)
+    if trace:
+        analyzer.profiler = StageProfiler(memory=profile_memory)
+    cache = DatasetCache(cache_dir, cache_size) if cache_dir and seed is not None else None
+    if cache is not None:
+        financial_data = cache.financial_data(analyzer)
+    else:
+        financial_data = analyzer.generate_financial_data()
+    timings['generation'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    stem = os.path.join(
+        output_dir,
+        f'{collectivite_name.replace(" ", "_")}_financial_data_{analyzer.start_year}_{analyzer.end_year}'
+    )
+    # Prévisions toujours annuelles : nommées d'après la période annuelle
+    annual_stem = stem
+    export_data = financial_data if freq == 'A' else analyzer.to_subannual(financial_data, freq)
+    if freq != 'A':
+        stem += f'_{freq}'
+    for fmt in formats:
+        if fmt in DATA_FORMATS:
+            with analyzer._span(f'export:{fmt}', 'export'):
+                files.append(write_financial_data(export_data, stem, fmt))
+    timings['export'] = time.perf_counter() - start
+    
+    validation = None
+    if validate:
+        start = time.perf_counter()
+        with analyzer._span('validation', 'analyse'):
+            violations = validate_financial_data(export_data)
+        validation = violations['Regle'].value_counts(sort=False).to_dict()
+        files.append(f'{stem}_validation.csv')
+        violations.to_csv(files[-1], index=False)
+        print(f"🔎 Validation comptable: {len(violations)} violation(s)"
+              + "".join(f"\n   • {rule}: {count}" for rule, count in validation.items()))
+        timings['validation'] = time.perf_counter() - start
+    
+    if forecast:
+        start = time.perf_counter()
+        with analyzer._span('prevision', 'analyse'):
+            projection = SeriesForecaster(forecast_method).forecast(financial_data, forecast)
+        projection.columns = [f'{column}_{label}' for column, label in projection.columns]
+        files.append(f'{annual_stem}_prevision_{forecast}.csv')
+        projection.reset_index().to_csv(files[-1], index=False)
+        timings['prevision'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    if 'png' in formats:
+        files.append(analyzer.create_financial_analysis(financial_data, output_dir=output_dir, show=False,
+                                                        n_workers=render_workers, quality=quality))
+        if quality != 'impression':
+            print(f"🖼️ Aperçu disponible: {files[-1]}")
+    if 'pdf' in formats:
+        files.append(analyzer.create_financial_analysis(financial_data, output_dir=output_dir, show=False,
+                                                        n_workers=max(render_workers or 0, 2),
+                                                        output_format='pdf', insights='png' not in formats))
+    timings['rendu'] = time.perf_counter() - start
+    
+    if full_quality and quality != 'impression' and 'png' in formats:
+        start = time.perf_counter()
+        files.append(analyzer.create_financial_analysis(financial_data, output_dir=output_dir, show=False,
+                                                        n_workers=render_workers, insights=False,
+                                                        quality='impression'))
+        timings['rendu_impression'] = time.perf_counter() - start
+    
+    if trace:
+        if trace.endswith('.trace.json'):
+            files.append(analyzer.profiler.to_chrome_trace(trace))
+        else:
+            files.append(analyzer.profiler.to_json(trace))
+        analyzer.profiler.close()
+    
+    return {
+        "collectivite": collectivite_name,
+        "type": collectivite_type,
+        "seed": analyzer.seed,
+        "periode": [analyzer.start_year, analyzer.end_year],
+        "fichiers": files,
+        "durees": timings,
+        "cache": None if cache is None else {"hits": cache.hits, "misses": cache.misses},
+        "validation": validation,
+        "demarrage": {
+            "import_modules": IMPORT_TIME,
+            "matplotlib_charge": 'matplotlib' in sys.modules,
+        },
+    }
+
+def load_batch_config(path):
+    """Charge une configuration de lot JSON
+    
+    Format attendu:
+    {"output_dir": "resultats", "max_workers": 4,
+     "cibles": [{"collectivite": "Région Réunion", "type": "region", "seed": 1}, ...]}
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    
+    targets = [(cible["collectivite"], cible["type"], cible.get("seed")) for cible in config["cibles"]]
+    return targets, config.get("output_dir", '.'), config.get("max_workers")
+
+def _progress_to_stderr():
+    """Initialisation d'un processus de travail : la progression affichée passe sur stderr"""
+    sys.stdout = sys.stderr
+
+def run_batch(targets, output_dir='.', max_workers=None, progress_to_stderr=False, **options):
+    """Analyse plusieurs collectivités en parallèle sur un pool de processus
+    
+    targets: liste de (nom, type) ou (nom, type, seed)
+    progress_to_stderr: les processus de travail affichent leur progression
+    sur stderr (quel que soit le mode de démarrage : fork, spawn, forkserver)
+    options: transmises à analyze_collectivite (start_year, end_year, formats)
+    Affiche un résumé des durées et retourne la liste des résultats.
+    """
+    print(f"🏛️ Analyse par lot de {len(targets)} collectivité(s)...")
+    start = time.perf_counter()
+    
+    initializer = _progress_to_stderr if progress_to_stderr else None
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer) as executor:
+        futures = [executor.submit(analyze_collectivite, *target[:2], output_dir=output_dir,
+                                   seed=target[2] if len(target) > 2 else None, **options)
+                   for target in targets]
+        results = [future.result() for future in futures]
+    
+    elapsed = time.perf_counter() - start
+    
+    # Résumé agrégé des durées
+    print("\n⏱️ RÉSUMÉ DES DURÉES:")
+    print(f"{'Collectivité':<25} {'Génération':>11} {'Export':>8} {'Rendu':>8} {'Total':>8}")
+    for result in results:
+        durees = result["durees"]
+        print(f"{result['collectivite']:<25} {durees['generation']:>10.2f}s {durees['export']:>7.2f}s "
+              f"{durees['rendu']:>7.2f}s {sum(durees.values()):>7.2f}s")
+    
+    cumulated = sum(sum(result["durees"].values()) for result in results)
+    print(f"Temps cumulé des analyses: {cumulated:.2f}s")
+    print(f"Temps écoulé du lot: {elapsed:.2f}s (accélération x{cumulated / elapsed:.1f})")
+    
+    caches = [result["cache"] for result in results if result["cache"] is not None]
+    if caches:
+        print(f"Cache de données: {sum(c['hits'] for c in caches)} succès, "
+              f"{sum(c['misses'] for c in caches)} échecs")
+    
+    return results
+
+# Clés acceptées dans une requête de scénario
+SCENARIO_KEYS = ('collectivite', 'type', 'seed', 'annees', 'parametres', 'panneaux', 'dpi')
+
+# Bornes d'une requête de scénario : une seule requête ne doit pas épuiser la mémoire d'un processus
+SCENARIO_MAX_YEARS = 200
+SCENARIO_MAX_DPI = 300
+SCENARIO_MAX_BODY = 2**20
+
+def normalize_scenario(request):
+    """Valide une requête de scénario et complète les valeurs par défaut
+    
+    Deux requêtes équivalentes donnent le même dictionnaire (clé de cache).
+    Lève ValueError si la requête est invalide.
+    """
+    if not isinstance(request, dict):
+        raise ValueError("La requête doit être un objet JSON")
+    unknown = sorted(set(request) - set(SCENARIO_KEYS))
+    if unknown:
+        raise ValueError(f"Clés inconnues: {', '.join(unknown)}")
+    
+    collectivite_type = request.get('type', 'departement')
+    if collectivite_type not in COLLECTIVITES:
+        raise ValueError(f"Type de collectivité inconnu: {collectivite_type}")
+    
+    panels = [panel for panel, _ in ReunionCollectiviteFinanceAnalyzer.DASHBOARD_PANELS]
+    requested = request.get('panneaux', False)
+    requested = panels if requested is True else list(requested or [])
+    unknown = sorted(set(requested) - set(panels))
+    if unknown:
+        raise ValueError(f"Panneaux inconnus: {', '.join(unknown)}")
+    
+    def is_int(value):
+        return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+    
+    seed = request.get('seed')
+    if seed is not None and not (is_int(seed) and seed >= 0):
+        raise ValueError("seed doit être un entier positif ou null")
+    
+    years = request.get('annees', [2002, 2025])
+    if not (isinstance(years, (list, tuple)) and len(years) == 2 and all(is_int(year) for year in years)):
+        raise ValueError("annees doit être une liste de deux entiers [debut, fin]")
+    start_year, end_year = years
+    if start_year > end_year:
+        raise ValueError("annees: l'année de début doit précéder l'année de fin")
+    if end_year - start_year + 1 > SCENARIO_MAX_YEARS:
+        raise ValueError(f"annees: au plus {SCENARIO_MAX_YEARS} années par scénario")
+    
+    parameters = request.get('parametres') or {}
+    if not isinstance(parameters, dict):
+        raise ValueError("parametres doit être un objet {nom: valeur}")
+    if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in parameters.values()):
+        raise ValueError("parametres: les valeurs doivent être des nombres")
+    
+    dpi = request.get('dpi', 72)
+    if not (is_int(dpi) and 0 < dpi <= SCENARIO_MAX_DPI):
+        raise ValueError(f"dpi doit être un entier entre 1 et {SCENARIO_MAX_DPI}")
+    
+    return {
+        'collectivite': request.get('collectivite') or COLLECTIVITES[collectivite_type],
+        'type': collectivite_type,
+        'seed': None if seed is None else int(seed),
+        'annees': [int(start_year), int(end_year)],
+        'parametres': {name: float(value) for name, value in parameters.items()},
+        'panneaux': [panel for panel in panels if panel in requested],
+        'dpi': int(dpi),
+    }
+
+def run_scenario(request):
+    """Calcule un scénario normalisé : séries, KPI et panneaux en PNG base64"""
+    analyzer = ReunionCollectiviteFinanceAnalyzer(request['collectivite'], request['type'], seed=request['seed'],
+                                                  start_year=request['annees'][0], end_year=request['annees'][1])
+    analyzer.config = analyzer._with_parameters(request['parametres'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = analyzer.generate_financial_data()
+    
+    panels = {}
+    if request['panneaux']:
+        for panel in request['panneaux']:
+            buffer = io.BytesIO()
+            _imsave(buffer, analyzer._render_panel(panel, df, dpi=request['dpi']), format='png')
+            panels[panel] = base64.b64encode(buffer.getvalue()).decode('ascii')
+    
+    return {
+        **request,
+        'seed': analyzer.seed,
+        'annees': df['Annee'].tolist(),
+        'series': {column: df[column].tolist() for column in df.columns if column != 'Annee'},
+        'kpis': {name: float(value) for name, value in compute_financial_kpis(df).iloc[0].items()},
+        'panneaux': panels,
+    }
+
+class ScenarioService:
+    """Service HTTP/JSON local de scénarios (asyncio, calculs dans un pool de processus)
+    
+    POST /scenario : corps JSON de clés SCENARIO_KEYS, réponse de run_scenario()
+    GET /sante : état du service et compteurs
+    Les résultats des scénarios avec graine sont gardés en mémoire (LRU de
+    cache_size entrées) ; des requêtes identiques simultanées partagent un
+    seul calcul.
+    """
+    
+    REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+    
+    def __init__(self, host='127.0.0.1', port=8765, max_workers=None, cache_size=256):
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.executor = None
+        self.server = None
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self.counters = {"requetes": 0, "calculs": 0, "cache": 0, "regroupees": 0, "erreurs": 0}
+    
+    async def start(self):
+        """Démarre le serveur (port 0 : port libre choisi par le système, voir self.port)"""
+        # Panneaux rendus par _figure/_imsave : aucun backend à imposer aux processus de travail
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        # Processus de travail créés avant toute socket : un fork ultérieur hériterait
+        # des connexions ouvertes et les clients n'en verraient jamais la fin
+        await asyncio.get_running_loop().run_in_executor(self.executor, os.getpid)
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+    
+    async def stop(self):
+        """Arrête le serveur et le pool de processus"""
+        self.server.close()
+        await self.server.wait_closed()
+        self.executor.shutdown()
+    
+    async def serve_forever(self):
+        await self.start()
+        print(f"🌐 Service de scénarios sur http://{self.host}:{self.port} (POST /scenario, GET /sante)")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+    
+    async def scenario(self, request):
+        """Résultat d'un scénario : cache, calcul en cours partagé ou nouveau calcul"""
+        request = normalize_scenario(request)
+        self.counters["requetes"] += 1
+        if request['seed'] is None:
+            # Sans graine, chaque requête est un tirage différent
+            return await self._compute(request)
+        
+        key = json.dumps(request, sort_keys=True)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.counters["cache"] += 1
+            return self._cache[key]
+        
+        if key in self._inflight:
+            self.counters["regroupees"] += 1
+            return await asyncio.shield(self._inflight[key])
+        
+        task = asyncio.ensure_future(self._compute(request))
+        self._inflight[key] = task
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            del self._inflight[key]
+        
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+    
+    async def _compute(self, request):
+        self.counters["calculs"] += 1
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, run_scenario, request)
+        except BrokenProcessPool:
+            # Processus de travail tué (mémoire épuisée...) : le pool ne servirait plus
+            # aucune requête, on le remplace une seule fois pour toutes les requêtes en échec.
+            # Processus lancés par spawn : un fork hériterait des connexions ouvertes.
+            if self.executor is executor:
+                executor.shutdown(wait=False)
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+            raise
+    
+    async def _route(self, method, path, body):
+        """(statut HTTP, corps JSON) d'une requête"""
+        if path == '/sante':
+            if method != 'GET':
+                return 405, {"erreur": "GET attendu"}
+            return 200, {"statut": "ok", "compteurs": self.counters, "cache": len(self._cache),
+                         "en_cours": len(self._inflight)}
+        if path == '/scenario':
+            if method != 'POST':
+                return 405, {"erreur": "POST attendu"}
+            return 200, await self.scenario(json.loads(body or b'{}'))
+        return 404, {"erreur": f"Chemin inconnu: {path}"}
+    
+    async def _handle(self, reader, writer):
+        """Lit une requête HTTP/1.1, répond en JSON puis ferme la connexion"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1')
+            method, path, _ = request_line.split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            if length < 0:
+                raise ValueError("Content-Length invalide")
+            if length > SCENARIO_MAX_BODY:
+                # Corps refusé sans être lu
+                status, payload = 413, {"erreur": f"Corps de requête limité à {SCENARIO_MAX_BODY} octets"}
+            else:
+                body = await reader.readexactly(length)
+                status, payload = await self._route(method, path.split('?')[0], body)
+        except (ValueError, asyncio.IncompleteReadError) as exc:
+            status, payload = 400, {"erreur": str(exc)}
+        except Exception as exc:
+            status, payload = 500, {"erreur": f"{type(exc).__name__}: {exc}"}
+        if status != 200:
+            self.counters["erreurs"] += 1
+        
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {self.REASONS[status]}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + data)
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
 
 def main():
     """Fonction principale pour La Réunion"""
@@ -949,5 +2802,121 @@ def main():
     print(f"📊 Période: {analyzer.start_year}-{analyzer.end_year}")
     print("📦 Données: Démographie, finances, investissements, dette")
 
+def parse_args(argv=None):
+    """Arguments de la ligne de commande du mode sans interaction"""
+    parser = argparse.ArgumentParser(
+        description="Analyse des comptes du Département et de la Région Réunion"
+    )
+    parser.add_argument('--type', choices=sorted(COLLECTIVITES), default='departement',
+                        help="type de collectivité (défaut: departement)")
+    parser.add_argument('--collectivite', help="nom de la collectivité (défaut: selon le type)")
+    parser.add_argument('--annees', nargs=2, type=int, metavar=('DEBUT', 'FIN'), default=(2002, 2025),
+                        help="première et dernière année simulées (défaut: 2002 2025)")
+    parser.add_argument('--output-dir', default='.', help="dossier de sortie (défaut: dossier courant)")
+    parser.add_argument('--formats', default='csv,png',
+                        help=f"sorties séparées par des virgules parmi {', '.join(OUTPUT_FORMATS)} (défaut: csv,png)")
+    parser.add_argument('--seed', type=int, help="graine pour une exécution reproductible")
+    parser.add_argument('--freq', choices=('A', 'Q', 'M'), default='A',
+                        help="résolution des données exportées: annuelle, trimestrielle, mensuelle (défaut: A)")
+    parser.add_argument('--batch', metavar='CONFIG',
+                        help="fichier JSON de lot (voir load_batch_config)")
+    parser.add_argument('--workers', type=int, help="nombre de processus pour --batch ou --serve")
+    parser.add_argument('--data-only', action='store_true',
+                        help="ne produire que les données (matplotlib n'est jamais importé)")
+    parser.add_argument('--render-workers', type=int,
+                        help="rendre les panneaux en parallèle sur N processus")
+    parser.add_argument('--quality', choices=tuple(ReunionCollectiviteFinanceAnalyzer.RENDER_QUALITIES),
+                        default='impression',
+                        help="qualité du tableau de bord: apercu (PNG 72 dpi), svg, impression (PNG 300 dpi, défaut)")
+    parser.add_argument('--full-quality', action='store_true',
+                        help="avec un aperçu, produire ensuite aussi la version d'impression")
+    parser.add_argument('--trace', metavar='FICHIER',
+                        help="écrire une trace des étapes (format Chrome si FICHIER finit par .trace.json)")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="inclure les allocations mémoire de chaque étape dans la trace")
+    parser.add_argument('--cache', metavar='DOSSIER',
+                        help="réutiliser les données déjà générées (avec --seed ou des graines de lot)")
+    parser.add_argument('--cache-size', type=int, default=512, metavar='MO',
+                        help="taille maximale du cache en Mo, entrées les moins récentes supprimées (défaut: 512)")
+    parser.add_argument('--prevision', type=int, default=0, metavar='ANNEES',
+                        help="exporter une prévision des séries sur ANNEES années après la fin de période")
+    parser.add_argument('--prevision-methode', choices=('ols', 'ets'), default='ols',
+                        help="méthode de prévision: ols (tendance linéaire, défaut) ou ets (statsmodels)")
+    parser.add_argument('--validate', action='store_true',
+                        help="vérifier la cohérence comptable des données et exporter les violations en CSV")
+    parser.add_argument('--serve', action='store_true',
+                        help="lancer le service HTTP/JSON local de scénarios (voir ScenarioService)")
+    parser.add_argument('--host', default='127.0.0.1', help="adresse d'écoute de --serve (défaut: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="port de --serve (défaut: 8765)")
+    parser.add_argument('--json', action='store_true',
+                        help="écrire les résultats structurés en JSON sur la sortie standard")
+    args = parser.parse_args(argv)
+    
+    args.formats = tuple(fmt.strip() for fmt in args.formats.split(',') if fmt.strip())
+    if args.data_only:
+        args.formats = tuple(fmt for fmt in args.formats if fmt in DATA_FORMATS) or ('csv',)
+    unknown = sorted(set(args.formats) - set(OUTPUT_FORMATS))
+    if unknown:
+        parser.error(f"format(s) inconnu(s): {', '.join(unknown)}")
+    start_year, end_year = args.annees
+    if start_year > end_year:
+        parser.error("--annees: l'année de début doit précéder l'année de fin")
+    if args.prevision < 0:
+        parser.error("--prevision doit être positif")
+    if args.prevision and end_year - start_year + 1 < 3:
+        parser.error("--prevision: au moins trois années sont nécessaires (--annees)")
+    return args
+
+def cli(argv=None):
+    """Point d'entrée sans interaction (cron, conteneurs)
+    
+    Rendu hors écran uniquement (sans pyplot ni changement de backend), jamais
+    de plt.show() ; retourne les résultats structurés.
+    """
+    args = parse_args(argv)
+    options = {
+        "start_year": args.annees[0],
+        "end_year": args.annees[1],
+        "formats": args.formats,
+        "render_workers": args.render_workers,
+        "freq": args.freq,
+        "quality": args.quality,
+        "full_quality": args.full_quality,
+        "cache_dir": args.cache,
+        "cache_size": args.cache_size * 2**20,
+        "forecast": args.prevision,
+        "forecast_method": args.prevision_methode,
+        "validate": args.validate,
+    }
+    
+    if args.serve:
+        service = ScenarioService(args.host, args.port, max_workers=args.workers)
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(service.serve_forever())
+        return []
+    
+    # En --json, la sortie standard ne porte que le résultat : la progression passe sur stderr,
+    # y compris celle des processus de travail du lot (voir run_batch)
+    with contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext():
+        if args.batch:
+            targets, output_dir, max_workers = load_batch_config(args.batch)
+            results = run_batch(targets, output_dir, args.workers or max_workers,
+                                progress_to_stderr=args.json, **options)
+        else:
+            collectivite = args.collectivite or COLLECTIVITES[args.type]
+            results = [analyze_collectivite(collectivite, args.type, args.output_dir, seed=args.seed,
+                                            trace=args.trace, profile_memory=args.profile_memory,
+                                            **options)]
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(f"\n⏱️ Démarrage: import des modules en {IMPORT_TIME * 1000:.0f} ms, "
+              f"matplotlib {'chargé' if 'matplotlib' in sys.modules else 'non chargé'}")
+    return results
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        cli()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,325 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from DReg import COLLECTIVITES, ReunionCollectiviteFinanceAnalyzer
+
+# Balayages par défaut (--quick réduit chaque liste à ses premières valeurs)
+HORIZONS = [24, 100, 1000, 10000]
+REPLICAS = [1, 100, 1000, 10000]
+DPIS = [72, 150, 300]
+
+def measure(function, repeat=3):
+    """Mesure une étape : meilleure durée sur `repeat` exécutions et pic mémoire (tracemalloc)
+
+    La sortie standard de l'étape est masquée pour ne mesurer que le calcul.
+    """
+    durations = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - start)
+
+    # Pic mémoire sur une exécution séparée : tracemalloc ralentit les allocations
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"duree_s": min(durations), "durees_s": durations, "pic_memoire_octets": peak}
+
+def make_analyzer(collectivite_type, n_years=24, seed=0):
+    """Analyseur de la collectivité par défaut du type, sur un horizon de n_years années"""
+    return ReunionCollectiviteFinanceAnalyzer(COLLECTIVITES[collectivite_type], collectivite_type,
+                                              seed=seed, start_year=2002, end_year=2002 + n_years - 1)
+
+def bench_generation(collectivite_type, horizons, repeat):
+    """Génération d'une réalisation selon l'horizon"""
+    results = []
+    for n_years in horizons:
+        analyzer = make_analyzer(collectivite_type, n_years)
+        results.append({"horizon": n_years, **measure(analyzer.generate_financial_data, repeat)})
+    return results
+
+def bench_trends(collectivite_type, horizons, repeat):
+    """Tendances réunionnaises appliquées à un DataFrame déjà généré"""
+    results = []
+    for n_years in horizons:
+        analyzer = make_analyzer(collectivite_type, n_years)
+        years = np.arange(analyzer.start_year, analyzer.end_year + 1)
+        raw = pd.DataFrame({'Annee': years, **analyzer._simulate_series(years)})
+        results.append({"horizon": n_years,
+                        **measure(lambda: analyzer._add_collectivite_trends(raw.copy()), repeat)})
+    return results
+
+def bench_insights(collectivite_type, horizons, repeat):
+    """Insights analytiques sur un DataFrame déjà généré"""
+    results = []
+    for n_years in horizons:
+        analyzer = make_analyzer(collectivite_type, n_years)
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = analyzer.generate_financial_data()
+        results.append({"horizon": n_years,
+                        **measure(lambda: analyzer._generate_financial_insights(df), repeat)})
+    return results
+
+def bench_ensemble(collectivite_type, replicas, repeat):
+    """Ensemble Monte Carlo selon le nombre de réplicas"""
+    results = []
+    for n_replicas in replicas:
+        analyzer = make_analyzer(collectivite_type)
+        results.append({"replicas": n_replicas,
+                        **measure(lambda: analyzer.generate_ensemble(n_replicas), repeat)})
+    return results
+
+def bench_rendering(collectivite_type, dpis, repeat):
+    """Rendu complet du tableau de bord selon la résolution (sans cache)
+
+    Un analyseur neuf par exécution : la figure est construite à chaque fois,
+    sans réutiliser le tableau de bord d'un rendu précédent.
+    """
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = make_analyzer(collectivite_type).generate_financial_data()
+    with tempfile.TemporaryDirectory() as output_dir:
+        for dpi in dpis:
+            render = lambda: make_analyzer(collectivite_type).create_financial_analysis(
+                df, output_dir=output_dir, show=False, cache=False, dpi=dpi, insights=False)
+            results.append({"dpi": dpi, **measure(render, repeat)})
+    return results
+
+def bench_dashboard_update(collectivite_type, dpis, repeat):
+    """Mise à jour en place et enregistrement d'un tableau de bord déjà construit"""
+    results = []
+    analyzer = make_analyzer(collectivite_type)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = analyzer.generate_financial_data()
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_file = os.path.join(output_dir, 'dashboard.png')
+        analyzer.dashboard(df)
+        for dpi in dpis:
+            update = lambda: analyzer.dashboard(df).save(output_file, dpi)
+            results.append({"dpi": dpi, **measure(update, repeat)})
+    return results
+
+def check_streams(collectivite_type):
+    """Garanties des flux aléatoires : (nom, vérifiée) pour chaque propriété promise
+
+    - ensemble identique en série et réparti sur plusieurs processus
+    - réplica 0 de l'ensemble identique à generate_financial_data()
+    - concaténation des morceaux d'années identique à une génération en une fois
+    - ensemble par morceaux de réplicas et d'années identique à generate_ensemble()
+    """
+    n_replicas = 2 * ReunionCollectiviteFinanceAnalyzer.REPLICA_BLOCK + 5
+    analyzer = make_analyzer(collectivite_type, n_years=30, seed=12345)
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = analyzer.generate_financial_data()
+        serial = analyzer.generate_ensemble(n_replicas)["valeurs"]
+        parallel = analyzer.generate_ensemble(n_replicas, n_workers=3)["valeurs"]
+    values = df.drop(columns='Annee').to_numpy()
+
+    chunks = pd.concat(list(analyzer.iter_financial_data(chunk_years=7)), ignore_index=True)
+    long = pd.concat(list(analyzer.iter_ensemble(n_replicas, chunk_replicas=10, chunk_years=9)))
+    long = long.sort_values(['Replica', 'Annee']).drop(columns=['Replica', 'Annee']).to_numpy()
+
+    return [
+        ("ensemble série = parallèle", np.array_equal(serial, parallel)),
+        ("ensemble[0] = generate_financial_data()", np.array_equal(serial[0], values)),
+        ("morceaux d'années = génération en une fois", chunks.equals(df)),
+        ("morceaux de réplicas = generate_ensemble()", np.array_equal(long.reshape(serial.shape), serial)),
+    ]
+
+def reference_trends(collectivite_type, df):
+    """Boucle d'origine des tendances réunionnaises (référence figée, ne pas modifier)
+
+    TREND_RULES doit en redonner exactement les valeurs.
+    """
+    for i, row in df.iterrows():
+        year = row['Annee']
+
+        # Développement initial (2002-2005)
+        if 2002 <= year <= 2005:
+            if collectivite_type == "departement":
+                df.loc[i, 'Investissement_Action_Sociale'] *= 1.4
+                df.loc[i, 'Investissement_Routes'] *= 1.5
+            else:
+                df.loc[i, 'Investissement_Lycees'] *= 1.4
+                df.loc[i, 'Investissement_Transport'] *= 1.6
+
+        # Plan de développement réunionnais (2006-2010)
+        if 2006 <= year <= 2010:
+            df.loc[i, 'Dotations_Etat'] *= 1.12
+            df.loc[i, 'Fonds_Europeens'] *= 1.25
+            df.loc[i, 'Investissement'] *= 1.18
+
+        # Impact de la crise financière (2008-2009)
+        if 2008 <= year <= 2009:
+            df.loc[i, 'Recettes_Totales'] *= 0.94
+            df.loc[i, 'Investissement'] *= 0.82
+
+        # Développement du tourisme et des infrastructures (2011-2015)
+        elif 2011 <= year <= 2015:
+            if collectivite_type == "departement":
+                df.loc[i, 'Investissement_Sante'] *= 1.3
+            else:
+                df.loc[i, 'Investissement_Tourisme'] *= 1.5
+                df.loc[i, 'Investissement_Transport'] *= 1.4
+
+        # Crise sociale de 2018 et plan de soutien
+        if year == 2018:
+            df.loc[i, 'Dotations_Etat'] *= 1.15
+            if collectivite_type == "departement":
+                df.loc[i, 'Investissement_Action_Sociale'] *= 1.4
+
+        # Impact de la crise COVID-19 (2020-2021)
+        if 2020 <= year <= 2021:
+            if year == 2020:
+                df.loc[i, 'Autres_Recettes'] *= 0.75
+                df.loc[i, 'Dotations_Etat'] *= 1.18
+                df.loc[i, 'Fonds_Europeens'] *= 1.22
+
+        # Plan de relance post-COVID spécifique aux DOM (2022-2025)
+        if year >= 2022:
+            df.loc[i, 'Investissement'] *= 1.16
+            if collectivite_type == "departement":
+                df.loc[i, 'Investissement_Sante'] *= 1.3
+            else:
+                df.loc[i, 'Investissement_Economie'] *= 1.4
+                df.loc[i, 'Investissement_Formation'] *= 1.35
+
+def check_trends(collectivite_type):
+    """TREND_RULES identique au bit près à la boucle de référence, y compris hors 2002-2025"""
+    results = []
+    for first, last in ((2002, 2025), (1990, 2040)):
+        analyzer = ReunionCollectiviteFinanceAnalyzer(COLLECTIVITES[collectivite_type], collectivite_type,
+                                                      seed=7, start_year=first, end_year=last)
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = analyzer.generate_financial_data()
+        # Valeurs quelconques (sans tendances) : la comparaison porte sur les seuls multiplicateurs
+        values = np.random.default_rng(first).uniform(1, 1000, size=(len(df), len(df.columns) - 1))
+        raw = pd.DataFrame({'Annee': df['Annee'], **dict(zip(df.columns[1:], values.T))})
+        expected, actual = raw.copy(), raw.copy()
+        reference_trends(collectivite_type, expected)
+        analyzer._add_collectivite_trends(actual)
+        results.append((f"tendances {first}-{last} = boucle de référence", actual.equals(expected)))
+    return results
+
+# Vérifications de --check, par type de collectivité
+CHECKS = [check_streams, check_trends]
+
+def run_checks(types):
+    """Exécute les vérifications de non-régression et retourne le nombre d'échecs"""
+    failures = 0
+    for collectivite_type in types:
+        print(f"🔎 Vérifications {COLLECTIVITES[collectivite_type]}...")
+        for check in CHECKS:
+            for name, ok in check(collectivite_type):
+                failures += not ok
+                print(f"  {'✅' if ok else '❌'} {name}")
+    return failures
+
+def environment():
+    """Versions et machine, pour comparer des résultats entre versions du code"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit or None,
+        "date": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plateforme": platform.platform(),
+        "processeurs": os.cpu_count(),
+    }
+
+def run(types, horizons, replicas, dpis, repeat, render=True):
+    """Exécute tous les balayages et retourne le rapport"""
+    report = {"environnement": environment(), "resultats": {}}
+    for collectivite_type in types:
+        print(f"⏱️ Benchmarks {COLLECTIVITES[collectivite_type]}...")
+        stages = {
+            "generation": bench_generation(collectivite_type, horizons, repeat),
+            "tendances": bench_trends(collectivite_type, horizons, repeat),
+            "insights": bench_insights(collectivite_type, horizons, repeat),
+            "ensemble": bench_ensemble(collectivite_type, replicas, repeat),
+        }
+        if render:
+            stages["rendu"] = bench_rendering(collectivite_type, dpis, repeat)
+            stages["rendu_maj"] = bench_dashboard_update(collectivite_type, dpis, repeat)
+        report["resultats"][collectivite_type] = stages
+    return report
+
+def _points(report):
+    """Aplatis les résultats : {(type, étape, paramètre): durée}"""
+    points = {}
+    for collectivite_type, stages in report["resultats"].items():
+        for stage, results in stages.items():
+            for result in results:
+                parameter = next(f"{k}={v}" for k, v in result.items() if k in ("horizon", "replicas", "dpi"))
+                points[(collectivite_type, stage, parameter)] = result["duree_s"]
+    return points
+
+def compare(baseline, report):
+    """Affiche le rapport des durées entre un rapport de référence et le rapport courant"""
+    old, new = _points(baseline), _points(report)
+    print(f"\n{'Type':<12} {'Étape':<11} {'Paramètre':<15} {'Avant':>10} {'Après':>10} {'Gain':>7}")
+    for key in sorted(old.keys() & new.keys()):
+        print(f"{key[0]:<12} {key[1]:<11} {key[2]:<15} {old[key]:>9.4f}s {new[key]:>9.4f}s "
+              f"{old[key] / new[key]:>6.2f}x")
+
+def print_summary(report):
+    """Résumé lisible du rapport"""
+    for collectivite_type, stages in report["resultats"].items():
+        print(f"\n📊 {COLLECTIVITES[collectivite_type]}")
+        for stage, results in stages.items():
+            for result in results:
+                parameter = next(f"{k}={v}" for k, v in result.items() if k in ("horizon", "replicas", "dpi"))
+                print(f"  {stage:<11} {parameter:<15} {result['duree_s'] * 1000:>10.2f} ms "
+                      f"{result['pic_memoire_octets'] / 1e6:>9.2f} Mo")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de DReg (génération, tendances, insights, rendu)")
+    parser.add_argument('--output', default='benchmark_results.json', help="fichier JSON des résultats")
+    parser.add_argument('--repeat', type=int, default=3, help="exécutions par mesure (meilleure durée retenue)")
+    parser.add_argument('--types', default='departement,region', help="types de collectivités")
+    parser.add_argument('--quick', action='store_true', help="balayages réduits")
+    parser.add_argument('--no-render', action='store_true', help="ne pas mesurer le rendu")
+    parser.add_argument('--compare', metavar='JSON', help="rapport de référence à comparer")
+    parser.add_argument('--check', action='store_true',
+                        help="vérifier les garanties de reproductibilité au lieu de mesurer (code de sortie 1 en cas d'échec)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        raise SystemExit(1 if run_checks(args.types.split(',')) else 0)
+
+    horizons, replicas, dpis = (HORIZONS[:2], REPLICAS[:3], DPIS[:1]) if args.quick else (HORIZONS, REPLICAS, DPIS)
+    report = run(args.types.split(','), horizons, replicas, dpis, args.repeat, render=not args.no_render)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print_summary(report)
+    print(f"\n💾 Résultats sauvegardés: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+    return report
+
+if __name__ == "__main__":
+    main()